@@ -1,3 +1,9 @@
+import argparse
+import bisect
+import concurrent.futures
+import heapq
+import itertools
+import json
 import math
 import sys
 
@@ -9,13 +15,16 @@ EPS = 1e-9
 
 class P:
     """Represents a 2D point."""
+    __slots__ = ("x", "y")
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
 
-def area(p: list[P]) -> float:
+def signed_area(p: list[P]) -> float:
     """
-    Calculates the area of the polygon using the Shoelace formula.
+    Calculates the signed area of the polygon using the Shoelace formula.
+    Positive for counter-clockwise vertex order, negative for clockwise.
     """
     A = 0.0
     n = len(p)
@@ -23,130 +32,767 @@ def area(p: list[P]) -> float:
         a = p[i]
         b = p[(i + 1) % n]
         A += a.x * b.y - b.x * a.y
-    return math.fabs(A) / 2.0
+    return A / 2.0
+
+# --- STRAIGHT SKELETON ---
+#
+# The inset polygon at height h is the wavefront of the straight skeleton: every edge
+# moves inward at unit speed along its own line, and every corner is the meeting point
+# of its two edge lines.  The wavefront only changes shape at two kinds of event:
+#   - edge event:  an edge shrinks to zero length and its two corners merge;
+#   - split event: a reflex corner runs into an opposite edge and the polygon splits.
+# A reflex corner that reaches the hit edge exactly at one of its corners (typically two
+# reflex corners meeting head-on, e.g. along two input edges on one line) is a vertex
+# event instead: the two corners swap partners.
+# StraightSkeleton computes all events once with a priority queue.  Corners are never
+# modified, only replaced, so every corner has a fixed trajectory X + h * d and a
+# lifetime, and the inset at any h is an O(n) lookup over that history.
+
+EDGE_EVENT = 0
+SPLIT_EVENT = 1
+# Not a wavefront event: files the next stretch of an edge (a, b) or of the path of a
+# reflex corner (a, -1), see _track_edge() and _track_corner()
+RENEW_EVENT = 2
+
+# Corners closer than this at an event are the same point
+MEET = 1e-7
+# A wavefront whose area is below this fraction of the polygon's has vanished: a
+# symmetric polygon collapses all at once, and rounding in its input leaves a cloud
+# of near-zero loops that would otherwise take O(n^2) events to clear
+VANISH = 1e-5
+# Polygon area per split-event grid cell, in corners: cells sized to the box would be
+# too coarse for a wavefront that starts out along a long, wiggly boundary
+CELL_CORNERS = 2
+
+def _clean(pts: list[tuple[float, float]]) -> list[tuple[float, float]]:
+    """Drops repeated and collinear corners, which have no bisector of their own."""
+    changed = True
+    while changed and len(pts) >= 3:
+        changed = False
+        n = len(pts)
+        for i in range(n):
+            ax, ay = pts[i - 1]
+            bx, by = pts[i]
+            cx, cy = pts[(i + 1) % n]
+            cross = (bx - ax) * (cy - by) - (by - ay) * (cx - bx)
+            if math.hypot(bx - ax, by - ay) < EPS or math.fabs(cross) < EPS:
+                del pts[i]
+                changed = True
+                break
+    return pts
+
+def _ccw_points(p: list[P]) -> list[tuple[float, float]]:
+    """Returns the corners as (x, y) tuples in counter-clockwise order."""
+    pts = [(q.x, q.y) for q in p]
+    if signed_area(p) < 0:
+        pts.reverse()
+    return _clean(pts)
 
-def shrink(p: list[P], h: float) -> list[P]:
+class CellGrid:
     """
-    Shrinks the polygon 'p' inward by distance 'h'.
-    Returns an empty list if the polygon collapses or offset lines are parallel.
+    Uniform grid of buckets of the given cell size over a bounding box.  Items are
+    registered under the cells of a box or of a convex polygon; a polygon is walked one
+    column at a time, so a long thin one lands in the cells along it rather than in its
+    whole box.  Anything outside the box is clamped onto its border cells.
     """
-    n = len(p)
-    r = []
-    
-    for i in range(n):
-        # a: previous point, b: current point, c: next point
-        a = p[(i - 1 + n) % n]
-        b = p[i]
-        c = p[(i + 1) % n]
-
-        # Vector BA (from b to a)
-        dx1 = a.x - b.x
-        dy1 = a.y - b.y
-        # Vector BC (from b to c)
-        dx2 = c.x - b.x
-        dy2 = c.y - b.y
-
-        # Lengths of adjacent edges
-        l1 = math.hypot(dx1, dy1)
-        l2 = math.hypot(dx2, dy2)
-
-        # Normalized vectors (unit length)
-        # Handle division by zero if an edge length is near zero
-        if l1 < EPS or l2 < EPS:
-            return [] 
-        
-        dx1 /= l1
-        dy1 /= l1
-        dx2 /= l2
-        dy2 /= l2
-
-        # Compute the inward offset direction (Normal vectors)
-        # Normal for segment BA: perpendicular to BA (Vector from b to a)
-        nx1 = dy1
-        ny1 = -dx1
-        
-        # Normal for segment BC: perpendicular to BC (Vector from b to c)
-        nx2 = dy2
-        ny2 = -dx2
-
-        # New corner is the intersection of the two offset lines:
-        # Line 1 (Offset of BC): Parallel to BC, passes through a point offset from B along normal of BC
-        # Line equation A1*x + B1*y = C1
-        A1 = dy2
-        B1 = -dx2
-        start1 = P(b.x + nx2 * h, b.y + ny2 * h)
-        C1 = A1 * start1.x + B1 * start1.y
-
-        # Line 2 (Offset of BA): Parallel to BA, passes through a point offset from B along normal of BA
-        # Line equation A2*x + B2*y = C2
-        A2 = dy1
-        B2 = -dx1
-        start2 = P(b.x + nx1 * h, b.y + ny1 * h)
-        C2 = A2 * start2.x + B2 * start2.y
-        
-        # Solve 2x2 system using Cramer's rule
-        D = A1 * B2 - A2 * B1
-
-        # If D is near zero, the offset lines are parallel or collinear
-        if math.fabs(D) < EPS:
-            return [] 
-
-        # Intersection point (new corner)
-        newX = (C1 * B2 - C2 * B1) / D
-        newY = (A1 * C2 - A2 * C1) / D
-        
-        r.append(P(newX, newY))
-        
-    return r
+    def __init__(self, x0: float, y0: float, x1: float, y1: float, cell: float):
+        w, h = x1 - x0, y1 - y0
+        self.cell = max(cell, EPS)
+        self.x0, self.y0 = x0, y0
+        self.cols = int(w / self.cell) + 1
+        self.rows = int(h / self.cell) + 1
+        self.cells = {}
 
-def main():
+    def _col(self, x: float) -> int:
+        return min(max(int((x - self.x0) // self.cell), 0), self.cols - 1)
+
+    def box(self, x0: float, y0: float, x1: float, y1: float) -> list[tuple[int, int]]:
+        cell, cols, rows = self.cell, self.cols - 1, self.rows - 1
+        i0 = min(max(int((x0 - self.x0) // cell), 0), cols)
+        i1 = min(max(int((x1 - self.x0) // cell), 0), cols)
+        j0 = min(max(int((y0 - self.y0) // cell), 0), rows)
+        j1 = min(max(int((y1 - self.y0) // cell), 0), rows)
+        return [(i, j) for i in range(i0, i1 + 1) for j in range(j0, j1 + 1)]
+
+    def polygon(self, pts: list[tuple[float, float]]) -> list[tuple[int, int]]:
+        """The cells meeting convex polygon pts (which may be a segment), column by column."""
+        xs = [x for x, _ in pts]
+        lo, hi = min(xs), max(xs)
+        keys = self.box(lo, min(y for _, y in pts), hi, max(y for _, y in pts))
+        if len(keys) <= 4:
+            return keys
+        cell, rows = self.cell, self.rows - 1
+        sides = list(zip(pts, pts[1:] + pts[:1]))
+        keys = []
+        i0, i1 = self._col(lo), self._col(hi)
+        for i in range(i0, i1 + 1):
+            # The y range of the polygon over column i; the end columns take any overhang
+            xa = lo if i == i0 else self.x0 + i * cell
+            xb = hi if i == i1 else self.x0 + (i + 1) * cell
+            ya, yb = math.inf, -math.inf
+            for (px, py), (qx, qy) in sides:
+                if px > qx:
+                    px, py, qx, qy = qx, qy, px, py
+                if px > xb or qx < xa:
+                    continue
+                if qx - px < EPS:
+                    ya, yb = min(ya, py, qy), max(yb, py, qy)
+                    continue
+                slope = (qy - py) / (qx - px)
+                for x in (max(px, xa), min(qx, xb)):
+                    y = py + slope * (x - px)
+                    ya, yb = min(ya, y), max(yb, y)
+            if ya > yb:
+                continue
+            j0 = min(max(int((ya - EPS - self.y0) // cell), 0), rows)
+            j1 = min(max(int((yb + EPS - self.y0) // cell), 0), rows)
+            keys.extend((i, j) for j in range(j0, j1 + 1))
+        return keys
+
+    def add(self, keys, item):
+        for key in keys:
+            self.cells.setdefault(key, []).append(item)
+
+    def gather(self, keys) -> set:
+        found = set()
+        for key in keys:
+            found.update(self.cells.get(key, ()))
+        return found
+
+class StraightSkeleton:
+    """
+    Event history of the inward wavefront of a simple polygon.
+    inset(h) returns the inset polygon(s) at height h and area_pieces() the exact
+    quadratic area function between consecutive events.
+    Split events are found through two CellGrids: one holds the region every wavefront
+    edge can sweep before it ends, the other the path every reflex corner can take, and
+    only edges and reflex corners sharing a cell are tested against each other.  Both are
+    filed only as far as the next edge event around them (see _life()), extended when an
+    event changes their neighbours, and filed in windows that start at half a cell and
+    double, by renewal events, so that what is filed stays within about twice what is
+    actually swept before a split ends it.  Convex polygons have no split events and
+    skip the grids, taking O(n log n).
+    """
+    def __init__(self, p: list[P]):
+        # Edge lines: inward unit normal (nx, ny) and offset c, so that the edge at
+        # height h lies on nx * x + ny * y = c + h
+        self.lines = []
+        # Corner trajectories (position X + h * d), lifetimes and link history
+        self.X = []
+        self.d = []
+        self.line_in = []
+        self.line_out = []
+        self.born = []
+        self.died = []
+        self.links = []   # links[v] = [(h, next corner), ...]
+        # Area of the wavefront: after events[k], area(h) = A0 + A1 h + A2 h^2
+        self.events = []
+        self.coeffs = []
+
+        pts = _ccw_points(p)
+        n = len(pts)
+        if n < 3:
+            return
+        for i in range(n):
+            ax, ay = pts[i]
+            bx, by = pts[(i + 1) % n]
+            length = math.hypot(bx - ax, by - ay)
+            nx, ny = -(by - ay) / length, (bx - ax) / length
+            self.lines.append((nx, ny, nx * ax + ny * ay))
+
+        self._now = 0.0
+        self._next = {}
+        self._prev = {}
+        self._owners = [set() for _ in range(n)]   # line -> corners whose outgoing edge lies on it
+        # Every corner stays inside the bounding box, and the wavefront is gone by the time
+        # it exceeds the largest inscribed circle, whose radius is at most half the box
+        xs, ys = [x for x, _ in pts], [y for _, y in pts]
+        x0, y0, x1, y1 = self._box = (min(xs), min(ys), max(xs), max(ys))
+        self._end = min(x1 - x0, y1 - y0) / 2.0 + EPS
+        cell = max(math.sqrt(CELL_CORNERS * math.fabs(signed_area(p)) / n), max(x1 - x0, y1 - y0) / n)
+        self._swept = CellGrid(*self._box, cell)   # wavefront edges, by the strips they sweep
+        self._paths = CellGrid(*self._box, cell)   # reflex corners, by the path they follow
+        self._window = cell / 2.0   # first stretch filed for an edge (in height) or a path
+        self._edges = []   # filed edges (e, f, line, nx, ny, c, e0, e1, f0, f1), see _schedule_splits()
+        self._rays = {}    # filed reflex corner v -> (v, x, y, dx, dy)
+        self._edge_reach = {}   # (e, f) -> (index in _edges, height first filed, filed up to, renewal queued)
+        self._lives = {}        # corner v -> _life(v) while its neighbours stay
+        self._ray_reach = {}    # reflex corner v -> (height first filed, filed up to, renewal queued)
+        self._S = [0.0, 0.0, 0.0]
+        self._heap = []
+
+        for i in range(n):
+            self._add_corner((i - 1) % n, i, pts[i])
+        for i in range(n):
+            self._link(i, (i + 1) % n)
+        self._record()
+        self._dust = VANISH * self.coeffs[0][0]
+        self._splits = any(self._reflex(i) for i in range(n))
+        for i in range(n):
+            self._schedule(i, initial=True)
+        self._run()
+
+    # --- corner bookkeeping ---
+
+    def _add_corner(self, line_in: int, line_out: int, at: tuple[float, float]) -> int:
+        """Creates a corner on two edge lines, passing through 'at' at the current height."""
+        n1x, n1y, c1 = self.lines[line_in]
+        n2x, n2y, c2 = self.lines[line_out]
+        D = n1x * n2y - n2x * n1y
+        if math.fabs(D) >= EPS:
+            # Intersection of the two moving lines, solved for h = 0 and per unit of h
+            X = ((c1 * n2y - c2 * n1y) / D, (n1x * c2 - n2x * c1) / D)
+            d = ((n2y - n1y) / D, (n1x - n2x) / D)
+        else:
+            # Collinear edges move together along their common normal; opposite edges
+            # have met, and the corner stays put until _zip() closes the spike at it
+            d = (n1x, n1y) if n1x * n2x + n1y * n2y > 0 else (0.0, 0.0)
+            X = (at[0] - self._now * d[0], at[1] - self._now * d[1])
+        v = len(self.X)
+        self.X.append(X)
+        self.d.append(d)
+        self.line_in.append(line_in)
+        self.line_out.append(line_out)
+        self.born.append(self._now)
+        self.died.append(math.inf)
+        self.links.append([])
+        return v
+
+    def _pos(self, v: int, h: float) -> tuple[float, float]:
+        return (self.X[v][0] + h * self.d[v][0], self.X[v][1] + h * self.d[v][1])
+
+    def _term(self, v: int, w: int) -> tuple[float, float, float]:
+        """Shoelace term of link v -> w as a quadratic in h."""
+        (px, py), (dx, dy) = self.X[v], self.d[v]
+        (qx, qy), (ex, ey) = self.X[w], self.d[w]
+        return (px * qy - qx * py, px * ey - ex * py + dx * qy - qx * dy, dx * ey - ex * dy)
+
+    def _link(self, v: int, w: int):
+        old = self._next.get(v)
+        self._lives.pop(v, None)
+        self._lives.pop(w, None)
+        if old is not None:
+            for k, t in enumerate(self._term(v, old)):
+                self._S[k] -= t
+        self._next[v] = w
+        self._prev[w] = v
+        self._owners[self.line_out[v]].add(v)
+        self.links[v].append((self._now, w))
+        for k, t in enumerate(self._term(v, w)):
+            self._S[k] += t
+
+    def _kill(self, v: int):
+        w = self._next.pop(v)
+        for k, t in enumerate(self._term(v, w)):
+            self._S[k] -= t
+        self._prev.pop(v, None)
+        self._owners[self.line_out[v]].discard(v)
+        self.died[v] = self._now
+
+    def _kill_loop(self, v: int):
+        """Removes a wavefront component that has collapsed to fewer than three corners."""
+        loop = [v]
+        w = self._next[v]
+        while w != v:
+            loop.append(w)
+            w = self._next[w]
+        for w in loop:
+            self._kill(w)
+
+    def _loop_too_small(self, v: int) -> bool:
+        w = self._next[v]
+        return w == v or self._next[w] == v
+
+    def _record(self):
+        self.events.append(self._now)
+        self.coeffs.append(tuple(s / 2.0 for s in self._S))
+
+    # --- event scheduling ---
+
+    def _schedule(self, v: int, initial: bool = False):
+        """Queues the edge events around a new corner v and the split events it takes part in."""
+        w = self._next[v]
+        for a, b in ((self._prev[v], v), (v, w)):
+            t = self._collapse_time(a, b)
+            if t is not None:
+                heapq.heappush(self._heap, (t, EDGE_EVENT, a, b))
+
+        # Edge events keep a convex wavefront convex, so it never has a split event
+        if not self._splits:
+            return
+        # Each initial edge is tracked once, by the corner it starts at
+        u = self._prev[v]
+        for e, f in [(v, w)] if initial else [(u, v), (v, w)]:
+            self._track_edge(e, f)
+        if self._reflex(v):
+            self._track_corner(v)
+        if initial:
+            return
+        # The neighbours' next edge events have changed, and with them how far they and
+        # the edges beyond them can get
+        for x in (u, w):
+            if self._reflex(x):
+                self._track_corner(x)
+        self._track_edge(self._prev[u], u)
+        self._track_edge(w, self._next[w])
+
+    def _reflex(self, v: int) -> bool:
+        """Whether the edge lines at corner v turn clockwise."""
+        (n1x, n1y, _), (n2x, n2y, _) = self.lines[self.line_in[v]], self.lines[self.line_out[v]]
+        return n1x * n2y - n1y * n2x < -EPS
+
+    def _life(self, v: int) -> float:
+        """
+        Height by which corner v is gone unless one of its neighbours changes first: the
+        next collapse of an edge at v, or leaving the box.  Kept until _link() changes them.
+        """
+        h = self._lives.get(v)
+        if h is None:
+            h = min(self._end, self._exit_time(v))
+            for a, b in ((self._prev[v], v), (v, self._next[v])):
+                t = self._collapse_time(a, b)
+                if t is not None:
+                    h = min(h, t)
+            self._lives[v] = h
+        return h
+
+    def _track_corner(self, v: int, renewal: bool = False):
+        """
+        Files reflex corner v under the cells of its path up to _life(v), beyond what is
+        already filed, and queues its split events against the edges filed there.  Most
+        reflex corners split an edge long before that bound, so the path is filed a
+        window at a time, like the sweep of an edge in _track_edge().
+        """
+        first, start, queued = self._ray_reach.get(v, (self._now, self._now, False))
+        if queued and not renewal:
+            return
+        h = self._life(v)
+        if h <= start:
+            self._ray_reach[v] = (first, start, False)
+            return
+        speed = math.hypot(*self.d[v])
+        window = max(self._window / speed, start - first)
+        queued = h > start + window
+        if queued:
+            h = start + window
+            heapq.heappush(self._heap, (h, RENEW_EVENT, v, -1))
+        self._ray_reach[v] = (first, h, queued)
+        keys = self._paths.polygon([self._pos(v, start), self._pos(v, h)])
+        ray = self._rays.get(v)
+        if ray is None:
+            self._rays[v] = ray = (v, *self.X[v], *self.d[v])
+        self._paths.add(keys, v)
+        edges, nxt = self._edges, self._next
+        live = [edges[k] for k in self._swept.gather(keys) if nxt.get(edges[k][0]) == edges[k][1]]
+        self._schedule_splits([ray], live)
+
+    def _track_edge(self, e: int, f: int, renewal: bool = False):
+        """
+        Files wavefront edge e -> f under the cells it sweeps until one of its corners is
+        gone, beyond what is already filed, and queues the split events of the reflex
+        corners filed there against it.  The sweep is filed a window of height at a time,
+        each as long as all the ones before it; a renewal event files the next window, and
+        until it falls due there is nothing more to file.
+        """
+        new = (len(self._edges), self._now, self._now, False)
+        index, first, start, queued = self._edge_reach.get((e, f), new)
+        if queued and not renewal:
+            return
+        h = min(self._life(e), self._life(f))
+        if h <= start:
+            self._edge_reach[(e, f)] = (index, first, start, False)
+            return
+        window = max(self._window, start - first)
+        queued = h > start + window
+        if queued:
+            h = start + window
+            heapq.heappush(self._heap, (h, RENEW_EVENT, e, f))
+        self._edge_reach[(e, f)] = (index, first, h, queued)
+        strip = [self._pos(e, start), self._pos(f, start), self._pos(f, h), self._pos(e, h)]
+        keys = self._swept.polygon(strip)
+        if index == len(self._edges):
+            # The line and the positions of e and f along it, as s0 + h * s1
+            line = self.line_out[e]
+            nx, ny, c = self.lines[line]
+            (ex, ey), (edx, edy), (fx, fy), (fdx, fdy) = self.X[e], self.d[e], self.X[f], self.d[f]
+            self._edges.append((e, f, line, nx, ny, c, ny * ex - nx * ey, ny * edx - nx * edy,
+                                ny * fx - nx * fy, ny * fdx - nx * fdy))
+        edge = self._edges[index]
+        self._swept.add(keys, index)
+        rays, nxt = self._rays, self._next
+        self._schedule_splits([rays[v] for v in self._paths.gather(keys) if v in nxt], [edge])
+
+    def _exit_time(self, v: int) -> float:
+        """Height at which corner v would leave the bounding box."""
+        (x, y), (dx, dy) = self.X[v], self.d[v]
+        x0, y0, x1, y1 = self._box
+        t = math.inf
+        for x, dx, lo, hi in ((x, dx, x0, x1), (y, dy, y0, y1)):
+            if dx > EPS:
+                t = min(t, (hi - x) / dx)
+            elif dx < -EPS:
+                t = min(t, (lo - x) / dx)
+        return max(t, self._now)
+
+    def _schedule_splits(self, rays: list[tuple], edges: list[tuple]):
+        """
+        Queues the split events of reflex corners (v, x, y, dx, dy) against wavefront edges
+        (e, f, line, nx, ny, c, e0, e1, f0, f1).  A corner never approaches its own lines,
+        so those pairs drop out with the ones moving apart.
+        """
+        now = self._now + EPS
+        hits = [(t, v, line)
+                for v, x, y, dx, dy in rays
+                for e, f, line, nx, ny, c, e0, e1, f0, f1 in edges
+                if (approach := nx * dx + ny * dy - 1.0) < -EPS
+                and (t := (c - nx * x - ny * y) / approach) > now
+                and e0 + t * e1 - EPS <= ny * (x + t * dx) - nx * (y + t * dy) <= f0 + t * f1 + EPS]
+        for t, v, line in hits:
+            heapq.heappush(self._heap, (t, SPLIT_EVENT, v, line))
+
+    def _collapse_time(self, a: int, b: int):
+        """Height at which edge a -> b shrinks to zero length, or None."""
+        nx, ny, _ = self.lines[self.line_out[a]]
+        ux, uy = ny, -nx
+        gap = ux * (self.X[b][0] - self.X[a][0]) + uy * (self.X[b][1] - self.X[a][1])
+        rate = ux * (self.d[b][0] - self.d[a][0]) + uy * (self.d[b][1] - self.d[a][1])
+        if rate > -EPS:
+            return None
+        return max(self._now, -gap / rate)
+
+    def _split_target(self, v: int, line: int, t: float):
+        """The corner owning the piece of 'line' that corner v hits at height t, if any."""
+        nx, ny, _ = self.lines[line]
+        ux, uy = ny, -nx
+        hx, hy = self._pos(v, t)
+        s = ux * hx + uy * hy
+        for e in self._owners[line]:
+            f = self._next[e]
+            if e == v or f == v:
+                continue
+            ex, ey = self._pos(e, t)
+            fx, fy = self._pos(f, t)
+            if ux * ex + uy * ey - EPS <= s <= ux * fx + uy * fy + EPS:
+                return e
+        return None
+
+    # --- event processing ---
+
+    def _run(self):
+        while self._heap:
+            t, kind, a, b = heapq.heappop(self._heap)
+            if kind == RENEW_EVENT:
+                if self.died[a] != math.inf:
+                    continue
+                self._now = t
+                if b < 0:
+                    self._track_corner(a, renewal=True)
+                elif self._next[a] == b:
+                    self._track_edge(a, b, renewal=True)
+                continue
+            if kind == EDGE_EVENT:
+                if self.died[a] != math.inf or self.died[b] != math.inf or self._next[a] != b:
+                    continue
+                self._now = t
+                self._edge_event(a, b)
+            else:
+                if self.died[a] != math.inf:
+                    continue
+                self._now = t
+                e = self._split_target(a, b, t)
+                if e is None:
+                    continue
+                w = self._meeting(a, e)
+                if w is not None:
+                    self._vertex_event(a, w)
+                else:
+                    self._split_event(a, e)
+            self._record()
+            A0, A1, A2 = self.coeffs[-1]
+            if A0 + t * (A1 + t * A2) < self._dust:
+                while self._next:
+                    self._kill_loop(next(iter(self._next)))
+                self._record()
+                return
+
+    def _meeting(self, v: int, e: int):
+        """
+        A corner at an end of the hit edge e -> f that v reaches at the same moment, if any:
+        then the split is really a vertex event between the two.
+        """
+        at = self._pos(v, self._now)
+        for w in (self._next[e], e):
+            wx, wy = self._pos(w, self._now)
+            if math.hypot(wx - at[0], wy - at[1]) < MEET and w not in (self._prev[v], self._next[v]):
+                return w
+        return None
+
+    def _edge_event(self, a: int, b: int):
+        before, after = self._prev[a], self._next[b]
+        w = self._add_corner(self.line_in[a], self.line_out[b], self._pos(a, self._now))
+        self._kill(a)
+        self._kill(b)
+        if before == b:
+            # Two corners only: the component is gone
+            self.died[w] = self._now
+            return
+        self._link(before, w)
+        self._link(w, after)
+        self._settle(w)
+
+    def _split_event(self, v: int, e: int):
+        f = self._next[e]
+        before, after = self._prev[v], self._next[v]
+        at = self._pos(v, self._now)
+        line = self.line_out[e]
+        # v1 closes the part before v onto the far end of the hit edge, v2 the part after v
+        v1 = self._add_corner(self.line_in[v], line, at)
+        v2 = self._add_corner(line, self.line_out[v], at)
+        self._kill(v)
+        self._link(before, v1)
+        self._link(v1, f)
+        self._link(e, v2)
+        self._link(v2, after)
+        self._settle(v1)
+        self._settle(v2)
+
+    def _vertex_event(self, v: int, w: int):
+        # The two corners swap partners: each new corner joins the edge into one of them
+        # to the edge out of the other
+        at = self._pos(v, self._now)
+        before_v, after_v = self._prev[v], self._next[v]
+        before_w, after_w = self._prev[w], self._next[w]
+        v1 = self._add_corner(self.line_in[v], self.line_out[w], at)
+        v2 = self._add_corner(self.line_in[w], self.line_out[v], at)
+        self._kill(v)
+        self._kill(w)
+        self._link(before_v, v1)
+        self._link(v1, after_w)
+        self._link(before_w, v2)
+        self._link(v2, after_v)
+        self._settle(v1)
+        self._settle(v2)
+
+    def _settle(self, w: int):
+        """Schedules a corner that an event has just linked in, or clears up what it closed."""
+        while self.died[w] == math.inf:
+            if self._loop_too_small(w):
+                self._kill_loop(w)
+            elif self.d[w] == (0.0, 0.0):
+                w = self._zip(w)
+            else:
+                self._schedule(w)
+                return
+
+    def _zip(self, w: int) -> int:
+        """
+        Closes the zero-width spike at a corner where two opposite edges lie on one line:
+        the shorter edge is used up against the longer one and the corner at its far end
+        is replaced by one that continues along the longer edge.
+        """
+        p, q = self._prev[w], self._next[w]
+        nx, ny, _ = self.lines[self.line_in[w]]
+        ux, uy = ny, -nx
+
+        def along(v):
+            x, y = self._pos(v, self._now)
+            return ux * x + uy * y
+
+        into, back = along(w) - along(p), along(w) - along(q)
+        if into < back - MEET:
+            z = self._add_corner(self.line_in[p], self.line_out[w], self._pos(p, self._now))
+            before, after, gone = self._prev[p], q, (p, w)
+        elif back < into - MEET:
+            z = self._add_corner(self.line_in[w], self.line_out[q], self._pos(q, self._now))
+            before, after, gone = p, self._next[q], (w, q)
+        else:
+            z = self._add_corner(self.line_in[p], self.line_out[q], self._pos(p, self._now))
+            before, after, gone = self._prev[p], self._next[q], (p, w, q)
+        if before in gone or after in gone:
+            # The whole component was the spike
+            self.died[z] = self._now
+            self._kill_loop(w)
+            return z
+        for v in gone:
+            self._kill(v)
+        self._link(before, z)
+        self._link(z, after)
+        return z
+
+    # --- queries ---
+
+    def inset(self, h: float) -> list[list[P]]:
+        """The inset polygon(s) at height h, each counter-clockwise."""
+        nxt = {}
+        for v in range(len(self.X)):
+            if self.born[v] <= h < self.died[v]:
+                history = self.links[v]
+                k = bisect.bisect_right(history, (h, math.inf)) - 1
+                nxt[v] = history[max(k, 0)][1]
+
+        polygons = []
+        seen = set()
+        for v in nxt:
+            if v in seen:
+                continue
+            loop = []
+            w = v
+            while w not in seen and w in nxt:
+                seen.add(w)
+                loop.append(P(*self._pos(w, h)))
+                w = nxt[w]
+            if len(loop) >= 3:
+                polygons.append(loop)
+        return polygons
+
+    def area_pieces(self):
+        """Yields (h0, h1, a, b, c): on [h0, h1] the wavefront area is a + b (h - h0) + c (h - h0)^2."""
+        for k in range(len(self.events) - 1):
+            h0, h1 = self.events[k], self.events[k + 1]
+            if h1 - h0 < EPS:
+                continue
+            A0, A1, A2 = self.coeffs[k]
+            yield h0, h1, A0 + A1 * h0 + A2 * h0 * h0, A1 + 2.0 * A2 * h0, A2
+
+def area_pieces(p: list[P]):
+    """
+    Yields (h0, h1, a, b, c): on h0 <= h <= h1 the inset of p has area
+    a + b * (h - h0) + c * (h - h0)^2.  Pieces are split at straight-skeleton events.
+    """
+    return StraightSkeleton(p).area_pieces()
+
+# --- ANALYTIC SOLVER ---
+#
+# Between skeleton events the volume h * area(h) is a cubic whose maximum has a closed form.
+
+def _best_on_piece(h0: float, h1: float, a: float, b: float, c: float) -> float:
+    """Maximum of h * area(h) on one quadratic piece, via the roots of its derivative."""
+    T = h1 - h0
+    # f(t) = (h0 + t) * (a + b t + c t^2), f'(t) = k0 + k1 t + k2 t^2
+    k0 = a + b * h0
+    k1 = 2.0 * (b + c * h0)
+    k2 = 3.0 * c
+    candidates = [0.0, T]
+    if math.fabs(k2) > EPS:
+        disc = k1 * k1 - 4.0 * k2 * k0
+        if disc >= 0:
+            root = math.sqrt(disc)
+            candidates.append((-k1 + root) / (2.0 * k2))
+            candidates.append((-k1 - root) / (2.0 * k2))
+    elif math.fabs(k1) > EPS:
+        candidates.append(-k0 / k1)
+
+    best = 0.0
+    for t in candidates:
+        if 0.0 <= t <= T:
+            best = max(best, (h0 + t) * max(0.0, a + b * t + c * t * t))
+    return best
+
+def max_volume(p: list[P]) -> float:
+    """Maximum of h * (inset area at h) over all heights, solved piece by piece."""
+    return max((_best_on_piece(*piece) for piece in area_pieces(p)), default=0.0)
+
+# --- INPUT / BATCH MODE ---
+
+def read_polygon(stream) -> list[P] | None:
+    """Reads one 'N' line followed by N 'x y' lines. Returns None on EOF or bad input."""
     try:
         # Read the number of corners N
-        N = int(sys.stdin.readline().strip())
+        N = int(stream.readline().strip())
     except:
-        return
+        return None
 
     p = []
     # Read points
     for _ in range(N):
         try:
-            line = sys.stdin.readline().strip()
+            line = stream.readline().strip()
             if not line: break
             x, y = map(float, line.split())
             p.append(P(x, y))
         except:
             break
-            
+
     if len(p) != N:
-        return # Exit if not enough points read
-
-    maxVolume = 0.0
-    
-    # Iterate H in multiples of 0.1, up to the maximum possible coordinate (25)
-    # 250 steps for 0.1 to 25.0
-    for h_step in range(1, 251):
-        h = h_step * 0.1
-
-        # 1. Calculate the shrunk polygon
-        innerPolygon = shrink(p, h)
-        
-        # If the shrink operation failed or the polygon collapsed
-        if not innerPolygon:
-            break
-        
-        # 2. Calculate the area of the shrunk polygon
-        current_area = area(innerPolygon)
-        
-        # When the area becomes very small (polygon collapses), stop.
-        if current_area < 1e-4:
-            break
-        
-        # 3. Calculate volume and update max
-        volume = current_area * h
-        maxVolume = max(maxVolume, volume)
+        return None # Not enough points read
+    return p
+
+def read_counted(stream):
+    """Yields corner lists from a 'T' line followed by T polygon blocks."""
+    try:
+        T = int(stream.readline().strip())
+    except:
+        return
+    for _ in range(T):
+        p = read_polygon(stream)
+        # A malformed block still takes its slot so the output stays aligned
+        yield None if p is None else [(q.x, q.y) for q in p]
+
+def read_jsonl(stream):
+    """Yields corner lists from JSON lines: [[x, y], ...] or {"points": [[x, y], ...]}."""
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+            if isinstance(record, dict):
+                record = record["points"]
+            yield [(float(x), float(y)) for x, y in record]
+        except (ValueError, KeyError, TypeError):
+            yield None
+
+def solve_polygon(corners: list[tuple[float, float]] | None) -> float | None:
+    """Worker entry point: maximum volume for one polygon given as (x, y) tuples, or None."""
+    if corners is None:
+        return None
+    return max_volume([P(x, y) for x, y in corners])
+
+def solve_batch(polygons, workers: int = 1, chunksize: int = 64):
+    """
+    Yields max_volume for every polygon, in input order (None for a malformed record).
+    With workers > 1 the polygons are spread over a process pool in chunks; input is
+    consumed one window at a time so arbitrarily long streams stay in bounded memory.
+    """
+    if workers <= 1:
+        yield from map(solve_polygon, polygons)
+        return
+
+    window = workers * chunksize * 4
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        polygons = iter(polygons)
+        while True:
+            batch = list(itertools.islice(polygons, window))
+            if not batch:
+                break
+            yield from pool.map(solve_polygon, batch, chunksize=chunksize)
+
+def main():
+    parser = argparse.ArgumentParser(description="Maximum box volume for polygon footprints.")
+    parser.add_argument("--batch", action="store_true",
+                        help="read a count T followed by T polygon blocks")
+    parser.add_argument("--jsonl", action="store_true",
+                        help="read one polygon per line as JSON")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="number of worker processes for batch input")
+    parser.add_argument("--chunksize", type=int, default=64,
+                        help="polygons handed to a worker at a time")
+    args = parser.parse_args()
+
+    if not args.batch and not args.jsonl:
+        p = read_polygon(sys.stdin)
+        if p is None:
+            return
+        maxVolume = max_volume(p)
+
+        # Output the maximum volume rounded to 2 decimal places
+        print(f"{maxVolume:.2f}")
+        return
 
-    # Output the maximum volume rounded to 2 decimal places
-    print(f"{maxVolume:.2f}")
+    polygons = read_jsonl(sys.stdin) if args.jsonl else read_counted(sys.stdin)
+    out = sys.stdout
+    for volume in solve_batch(polygons, args.workers, args.chunksize):
+        out.write("Invalid\n" if volume is None else f"{volume:.2f}\n")
 
 if __name__ == "__main__":
     main()
@@ -1,17 +1,33 @@
 import sys
 import math
+import argparse
 import collections
-
-# Epsilon for floating-point comparisons
+import concurrent.futures
+import functools
+import heapq
+import itertools
+import json
+import time
+from fractions import Fraction
+
+# Epsilon for floating-point comparisons (only used on derived float lengths)
 EPSILON = 1e-9
 
+def _exact(v):
+    """Integer input stays integer; anything else becomes an exact Fraction."""
+    return v if isinstance(v, int) else Fraction(v)
+
 class Point:
-    """Represents a point with utility for comparisons."""
+    """
+    Represents a point with exact coordinates (int or Fraction).
+    Stick endpoints are integers and intersections are Fractions, so hashing,
+    equality and ordering are exact and always agree with each other.
+    """
+    __slots__ = ("x", "y")
+
     def __init__(self, x, y):
-        # Rounding is applied aggressively here because the problem asks for 2 decimal places 
-        # for intersection points, and floating point issues are critical.
-        self.x = round(x, 10)
-        self.y = round(y, 10)
+        self.x = _exact(x)
+        self.y = _exact(y)
 
     def __hash__(self):
         return hash((self.x, self.y))
@@ -19,14 +35,11 @@ class Point:
     def __eq__(self, other):
         if not isinstance(other, Point):
             return False
-        return math.isclose(self.x, other.x, abs_tol=EPSILON) and \
-               math.isclose(self.y, other.y, abs_tol=EPSILON)
+        return self.x == other.x and self.y == other.y
 
     def __lt__(self, other):
         # Used for sorting/canonical representation
-        if math.isclose(self.x, other.x, abs_tol=EPSILON):
-            return self.y < other.y
-        return self.x < other.x
+        return (self.x, self.y) < (other.x, other.y)
 
     def dist_sq(self, other):
         return (self.x - other.x)**2 + (self.y - other.y)**2
@@ -36,6 +49,8 @@ class Point:
 
 class Stick:
     """Represents an original stick segment."""
+    __slots__ = ("p1", "p2", "length", "index")
+
     def __init__(self, p1, p2, index):
         self.p1 = p1
         self.p2 = p2
@@ -50,11 +65,11 @@ def cross_product(p1, p2, p3):
 
 def on_segment(p, a, b):
     """Checks if point p lies on segment ab."""
-    # Check collinearity and bounding box
-    if math.fabs(cross_product(a, b, p)) > EPSILON:
+    # Check collinearity (exact orientation test) and bounding box
+    if cross_product(a, b, p) != 0:
         return False
-    return (p.x >= min(a.x, b.x) - EPSILON and p.x <= max(a.x, b.x) + EPSILON and
-            p.y >= min(a.y, b.y) - EPSILON and p.y <= max(a.y, b.y) + EPSILON)
+    return (min(a.x, b.x) <= p.x <= max(a.x, b.x) and
+            min(a.y, b.y) <= p.y <= max(a.y, b.y))
 
 def find_intersection(s1, s2):
     """
@@ -74,12 +89,13 @@ def find_intersection(s1, s2):
 
     det = A * E - D * B
 
-    if math.fabs(det) < EPSILON:
+    if det == 0:
         # Lines are parallel or collinear. The problem implies simple intersection for the figure.
         return None
 
-    x = (C * E - F * B) / det
-    y = (A * F - D * C) / det
+    # Exact rational intersection
+    x = Fraction(C * E - F * B) / det
+    y = Fraction(A * F - D * C) / det
     
     intersection = Point(x, y)
     
@@ -104,7 +120,7 @@ def shoelace_area(vertices):
     if len(vertices) < 3:
         return 0.0
     
-    area = 0.0
+    area = 0
     for i in range(len(vertices)):
         p1 = vertices[i]
         p2 = vertices[(i + 1) % len(vertices)]
@@ -112,19 +128,316 @@ def shoelace_area(vertices):
         
     return math.fabs(area) / 2.0
 
+# --- SWEEP-LINE INTERSECTION ---
+
+def sweep_intersecting_pairs(sticks):
+    """
+    Bentley-Ottmann sweep. Returns every pair (i, j), i < j, of sticks that share at
+    least one point, in O((N + k) log N) for k reported pairs.
+
+    All arithmetic is exact (integers and Fractions). The plane is first sheared by
+    x' = K * x + y, which keeps every intersection but leaves no vertical stick, so the
+    sweep never has to order segments that are parallel to the sweep line.
+    """
+    K = 2 * max((math.ceil(abs(c)) for s in sticks
+                 for c in (s.p1.x, s.p1.y, s.p2.x, s.p2.y)), default=0) + 1
+
+    segs = {}       # stick index -> (lx, ly, rx, ry) with lx < rx in sheared space
+    slopes = {}
+    starts = collections.defaultdict(list)
+    events = []
+    queued = set()
+
+    def push(p):
+        if p not in queued:
+            queued.add(p)
+            heapq.heappush(events, p)
+
+    for s in sticks:
+        a = (K * s.p1.x + s.p1.y, s.p1.y)
+        b = (K * s.p2.x + s.p2.y, s.p2.y)
+        if a == b:
+            continue # A zero-length stick cannot meet another one in a single point
+        if b < a:
+            a, b = b, a
+        segs[s.index] = a + b
+        slopes[s.index] = Fraction(b[1] - a[1], b[0] - a[0])
+        starts[a].append(s.index)
+        push(a)
+        push(b)
+
+    def side(i, px, py):
+        """> 0 if (px, py) lies above segment i, 0 on its line, < 0 below it."""
+        lx, ly, rx, ry = segs[i]
+        return (rx - lx) * (py - ly) - (ry - ly) * (px - lx)
+
+    def crossing(i, j):
+        """The single intersection point of segments i and j, or None."""
+        ax, ay, bx, by = segs[i]
+        cx, cy, dx, dy = segs[j]
+        d1x, d1y = bx - ax, by - ay
+        d2x, d2y = dx - cx, dy - cy
+        denom = d1x * d2y - d1y * d2x
+        if denom == 0:
+            return None # Parallel or collinear
+        ex, ey = cx - ax, cy - ay
+        t = Fraction(ex * d2y - ey * d2x, denom)
+        u = Fraction(ex * d1y - ey * d1x, denom)
+        if not (0 <= t <= 1 and 0 <= u <= 1):
+            return None
+        return (ax + t * d1x, ay + t * d1y)
+
+    def check(i, j, p):
+        q = crossing(i, j)
+        if q is not None and q > p:
+            push(q)
+
+    # Status: active segments ordered bottom to top just right of the sweep line
+    status = []
+    pairs = set()
+
+    while events:
+        p = heapq.heappop(events)
+        px, py = p
+        upper = starts.pop(p, [])
+
+        # Segments through p form one contiguous block status[lo:hi]
+        lo, hi = 0, len(status)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if side(status[mid], px, py) > 0:
+                lo = mid + 1
+            else:
+                hi = mid
+        hi = lo
+        while hi < len(status) and side(status[hi], px, py) == 0:
+            hi += 1
+
+        through = status[lo:hi]
+        meeting = upper + through
+        if len(meeting) > 1:
+            for a, b in itertools.combinations(meeting, 2):
+                pairs.add((a, b) if a < b else (b, a))
+
+        # Segments ending at p leave; the rest re-enter in their order right of p
+        block = [i for i in through if segs[i][2:] != p] + upper
+        block.sort(key=lambda i: (slopes[i], i))
+        status[lo:hi] = block
+
+        if not block:
+            if 0 < lo < len(status):
+                check(status[lo - 1], status[lo], p)
+        else:
+            if lo > 0:
+                check(status[lo - 1], block[0], p)
+            end = lo + len(block)
+            if end < len(status):
+                check(block[-1], status[end], p)
+
+    return pairs
+
+# --- SPATIAL INDEX ---
+
+class StickGrid:
+    """
+    Uniform grid over the sticks. Every stick is registered in each cell its segment
+    passes through, so a long diagonal costs cells in proportion to its length rather
+    than to its bounding-box area; the cell size defaults to the mean bounding-box
+    extent, so a typical stick lands in at most four cells.
+    """
+    def __init__(self, sticks, cell=None):
+        self.sticks = sticks
+        self.boxes = [(min(s.p1.x, s.p2.x), min(s.p1.y, s.p2.y),
+                       max(s.p1.x, s.p2.x), max(s.p1.y, s.p2.y)) for s in sticks]
+        if cell is None:
+            extents = [max(x1 - x0, y1 - y0) for x0, y0, x1, y1 in self.boxes]
+            cell = sum(extents) / len(extents) if extents else 1.0
+        self.cell = max(cell, 1.0)
+        self.cells = collections.defaultdict(list)
+        for idx, s in enumerate(sticks):
+            for key in self._keys(s.p1.x, s.p1.y, s.p2.x, s.p2.y):
+                self.cells[key].append(idx)
+
+    def _keys(self, x0, y0, x1, y1):
+        """Cells met by the closed segment, one column at a time."""
+        c = self.cell
+        if x0 > x1:
+            x0, y0, x1, y1 = x1, y1, x0, y0
+        slope = (y1 - y0) / (x1 - x0) if x1 != x0 else 0.0
+        # Padding keeps a crossing on a cell border inside the cells of both sticks
+        pad = c * 1e-9
+        for cx in range(math.floor(x0 / c), math.floor(x1 / c) + 1):
+            if x1 == x0:
+                ya, yb = y0, y1
+            else:
+                ya = y0 + slope * (max(x0, cx * c - pad) - x0)
+                yb = y0 + slope * (min(x1, (cx + 1) * c + pad) - x0)
+            lo, hi = min(ya, yb) - pad, max(ya, yb) + pad
+            for cy in range(math.floor(lo / c), math.floor(hi / c) + 1):
+                yield (cx, cy)
+
+    def _overlap(self, i, j):
+        a, b = self.boxes[i], self.boxes[j]
+        return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+    def candidate_pairs(self):
+        """Pairs (i, j), i < j, of sticks sharing a cell with overlapping bounding boxes."""
+        pairs = set()
+        for bucket in self.cells.values():
+            for a, b in itertools.combinations(bucket, 2):
+                if self._overlap(a, b):
+                    pairs.add((a, b) if a < b else (b, a))
+        return pairs
+
+def grid_intersecting_pairs(sticks):
+    """Candidate pairs from a StickGrid; a superset of the pairs that share a point."""
+    return StickGrid(sticks).candidate_pairs()
+
+# Candidate-pair engines selectable in solve()
+PAIR_ENGINES = {
+    "sweep": sweep_intersecting_pairs,
+    "grid": grid_intersecting_pairs,
+}
+
+def find_all_intersections(sticks, engine="sweep"):
+    """
+    Returns (intersections, stick_points): the intersection Point of every pair
+    (i, j), and for every stick the list of intersection Points lying on it, both
+    filled in one pass over the candidate pairs.
+    """
+    intersections = {} # Key: (stick_idx1, stick_idx2), Value: Point
+    stick_points = [[] for _ in sticks]
+    for i, j in sorted(PAIR_ENGINES[engine](sticks)):
+        p = find_intersection(sticks[i], sticks[j])
+        if p:
+            intersections[(i, j)] = p
+            stick_points[i].append(p)
+            stick_points[j].append(p)
+    return intersections, stick_points
+
+# --- PLANAR FACES ---
+
+def face_walks(vertex_list, adj):
+    """
+    Enumerates the faces of the planar arrangement in O(E log E).
+
+    Dangling edges are peeled off first (they cannot lie on a closed figure). Each
+    vertex then sorts its neighbours by angle, and every directed edge u -> v is
+    followed by v -> w, where w is the neighbour of v just clockwise of u. Walking
+    these half-edges traces every face once with the face on its left, so bounded
+    faces come out counter-clockwise (positive area) and outer faces clockwise.
+    Returns a list of (signed area, [vertex ids]) pairs.
+    """
+    nbrs = collections.defaultdict(set)
+    for u, edges in adj.items():
+        for v, _, _ in edges:
+            if v != u:
+                nbrs[u].add(v)
+
+    # Peel degree-1 vertices until only the 2-core remains
+    stack = [u for u in nbrs if len(nbrs[u]) == 1]
+    while stack:
+        u = stack.pop()
+        for v in nbrs.pop(u, ()):
+            nbrs[v].discard(u)
+            if len(nbrs[v]) == 1:
+                stack.append(v)
+
+    # Neighbours in counter-clockwise order, and each neighbour's position in that order
+    order = {}
+    rank = {}
+    for u, vs in nbrs.items():
+        if not vs:
+            continue
+        pu = vertex_list[u]
+        ring = sorted(vs, key=lambda v: math.atan2(float(vertex_list[v].y - pu.y),
+                                                   float(vertex_list[v].x - pu.x)))
+        order[u] = ring
+        for k, v in enumerate(ring):
+            rank[(u, v)] = k
+
+    faces = []
+    seen = set()
+    for u, ring in order.items():
+        for v in ring:
+            if (u, v) in seen:
+                continue
+            cycle = []
+            a, b = u, v
+            while (a, b) not in seen:
+                seen.add((a, b))
+                cycle.append(a)
+                # Next half-edge: leave b by the neighbour just clockwise of a
+                ring_b = order[b]
+                a, b = b, ring_b[rank[(b, a)] - 1]
+            area = 0
+            for k in range(len(cycle)):
+                p1 = vertex_list[cycle[k]]
+                p2 = vertex_list[cycle[(k + 1) % len(cycle)]]
+                area += p1.x * p2.y - p2.x * p1.y
+            faces.append((area / 2, cycle))
+    return faces
+
+def simple_loops(walk):
+    """
+    Splits a closed walk of vertex ids into the simple cycles it strings together.
+    Back-and-forth pieces along bridges come out as two-vertex loops.
+    """
+    loops = []
+    stack = []
+    where = {}
+    for v in walk + walk[:1]:
+        if v in where:
+            k = where[v]
+            loops.append(stack[k:])
+            for u in stack[k + 1:]:
+                del where[u]
+            del stack[k + 1:]
+        else:
+            where[v] = len(stack)
+            stack.append(v)
+    return loops
+
+def find_closed_figure(vertex_list, adj):
+    """
+    Kalyan's closed figure: the largest simple loop on the outer boundary of a
+    bounded region, so sticks crossing the inside of a figure do not cut it up. It is
+    returned as a list of Points that repeats its first point at the end, or [] if
+    the sticks enclose nothing.
+
+    The outer boundary of every connected piece is one of its clockwise face walks;
+    where pieces of a region touch at a vertex or hang off a bridge, the walk is split
+    into its simple loops.
+    """
+    best_area, best = 0, None
+    for area, walk in face_walks(vertex_list, adj):
+        if area >= 0:
+            continue
+        for loop in simple_loops(walk):
+            if len(loop) < 3:
+                continue
+            points = [vertex_list[v] for v in loop]
+            loop_area = shoelace_area(points)
+            if loop_area > best_area:
+                best_area, best = loop_area, points
+    if best is None:
+        return []
+    return best + best[:1]
+
 # --- MAIN SOLVER ---
 
-def solve():
+def read_game(stream):
+    """Reads one 'N' line and N 'x1 y1 x2 y2' lines. Returns the Sticks, or None on bad input."""
     try:
         # Read N
-        n_line = sys.stdin.readline().strip()
-        if not n_line: return "Abandoned"
+        n_line = stream.readline().strip()
+        if not n_line: return None
         N = int(n_line)
         
         # Read sticks
         sticks = []
         for i in range(N):
-            line = sys.stdin.readline().strip()
+            line = stream.readline().strip()
             if not line: raise EOFError
             coords = list(map(int, line.split()))
             p1 = Point(coords[0], coords[1])
@@ -132,7 +445,27 @@ def solve():
             sticks.append(Stick(p1, p2, i))
 
     except Exception:
-        return "Abandoned" # Handle incomplete or malformed input
+        return None # Handle incomplete or malformed input
+    return sticks
+
+def solve(engine="sweep"):
+    sticks = read_game(sys.stdin)
+    if sticks is None:
+        return "Abandoned"
+    return evaluate_game(sticks, engine)
+
+def evaluate_game(sticks, engine="sweep", timings=None):
+    """
+    Plays one game. If a dict is passed as 'timings', the seconds spent in each stage
+    are stored under "intersection", "graph", "cycle" and "scoring".
+    """
+    last = [time.perf_counter()]
+
+    def lap(stage):
+        if timings is not None:
+            now = time.perf_counter()
+            timings[stage] = now - last[0]
+            last[0] = now
 
     # 1. Identify all unique vertices (endpoints and intersections)
     vertices = set()
@@ -140,19 +473,14 @@ def solve():
         vertices.add(s.p1)
         vertices.add(s.p2)
 
-    intersections = {} # Key: (stick_idx1, stick_idx2), Value: Point
-
-    for i in range(N):
-        for j in range(i + 1, N):
-            p = find_intersection(sticks[i], sticks[j])
-            if p:
-                vertices.add(p)
-                intersections[(i, j)] = p
+    # Only candidate pairs from the sweep (or grid) can produce an intersection point
+    intersections, stick_points = find_all_intersections(sticks, engine)
+    vertices.update(intersections.values())
 
     # Map Point object to a unique integer ID
     vertex_list = sorted(list(vertices))
     v_to_id = {v: i for i, v in enumerate(vertex_list)}
-    num_v = len(vertex_list)
+    lap("intersection")
     
     # 2. Build the graph of connected segments
     # Adjacency list: adj[u] = list of (v, segment_length, stick_index)
@@ -168,10 +496,9 @@ def solve():
         stick_vertices = {s.p1, s.p2}
         
         # Add internal intersection points
-        for (i, j), p in intersections.items():
-            if i == stick_idx or j == stick_idx:
-                if on_segment(p, s.p1, s.p2):
-                    stick_vertices.add(p)
+        for p in stick_points[stick_idx]:
+            if on_segment(p, s.p1, s.p2):
+                stick_vertices.add(p)
         
         # Sort vertices along the stick to find sequential segments
         sorted_points = sorted(list(stick_vertices))
@@ -179,10 +506,6 @@ def solve():
         for i in range(len(sorted_points) - 1):
             p_start = sorted_points[i]
             p_end = sorted_points[i+1]
-            
-            # Skip if the segment is negligibly short
-            if p_start.dist(p_end) < EPSILON:
-                continue
 
             u = v_to_id[p_start]
             v = v_to_id[p_end]
@@ -197,32 +520,12 @@ def solve():
             seg_key = (stick_idx, min(u, v), max(u, v))
             all_segments[seg_key] = length
 
+    lap("graph")
 
-    # 3. Find the simple closed figure (DFS-based cycle detection)
-    
-    kalyan_cycle = [] # Stores the list of Point objects that form the cycle
+    # 3. Find the simple closed figure (face traversal of the planar arrangement)
     
-    def dfs_cycle(u, start_node, path_ids, path_points):
-        nonlocal kalyan_cycle
-
-        for v_id, _, _ in adj[u]:
-            if kalyan_cycle: return # Found a cycle, stop searching
-
-            if v_id == start_node and len(path_ids) >= 3:
-                # Found the closed figure
-                kalyan_cycle = path_points + [vertex_list[start_node]]
-                return
-
-            if v_id not in path_ids:
-                # Add current node/point and continue DFS
-                dfs_cycle(v_id, start_node, path_ids + [v_id], path_points + [vertex_list[v_id]])
-    
-    # Start DFS from every vertex to find a cycle
-    for start_id in range(num_v):
-        if not kalyan_cycle:
-            dfs_cycle(start_id, start_id, [start_id], [vertex_list[start_id]])
-        else:
-            break
+    kalyan_cycle = find_closed_figure(vertex_list, adj) # Stores the list of Point objects that form the cycle
+    lap("cycle")
 
     if not kalyan_cycle:
         return "Abandoned"
@@ -251,7 +554,7 @@ def solve():
         length = p_start.dist(p_end)
         
         for neighbor_v, seg_len, stick_idx in adj[u]:
-            if neighbor_v == v and math.isclose(seg_len, length, abs_tol=EPSILON):
+            if neighbor_v == v:
                 # Found the segment. This segment may belong to multiple collinear sticks, 
                 # but we just need one to identify the segment's key.
                 if min_stick_idx == -1 or stick_idx < min_stick_idx:
@@ -291,6 +594,7 @@ def solve():
         computer_area = (computer_perimeter ** 2) / (4 * math.pi)
 
     # 7. Determine the Winner
+    lap("scoring")
     
     # The problem guarantees no tie, so simple comparison is enough.
     if kalyan_area > computer_area:
@@ -298,6 +602,106 @@ def solve():
     else:
         return "Computer"
 
+# --- BATCH MODE ---
+
+STAGES = ("intersection", "graph", "cycle", "scoring")
+
+def read_counted(stream):
+    """Yields stick coordinate lists from a 'T' line followed by T game blocks."""
+    try:
+        T = int(stream.readline().strip())
+    except Exception:
+        return
+    for _ in range(T):
+        sticks = read_game(stream)
+        # A malformed block is still a game: it is reported as abandoned
+        yield None if sticks is None else [(s.p1.x, s.p1.y, s.p2.x, s.p2.y) for s in sticks]
+
+def read_jsonl(stream):
+    """Yields stick coordinate lists from JSON lines: [[x1, y1, x2, y2], ...] or {"sticks": [...]}."""
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+            if isinstance(record, dict):
+                record = record["sticks"]
+            sticks = [tuple(stick) for stick in record]
+        except (ValueError, KeyError, TypeError):
+            sticks = None
+        # A stick with the wrong number of coordinates, or a coordinate that is not a JSON
+        # integer (floats, strings, booleans), abandons the game, like bad JSON
+        if sticks is not None and any(
+                len(stick) != 4 or any(not isinstance(c, int) or isinstance(c, bool) for c in stick)
+                for stick in sticks):
+            sticks = None
+        yield sticks
+
+def play_game(coords, engine="sweep"):
+    """Worker entry point: returns (result, per-stage seconds) for one game."""
+    timings = {}
+    if coords is None:
+        return "Abandoned", timings
+    sticks = [Stick(Point(x1, y1), Point(x2, y2), i) for i, (x1, y1, x2, y2) in enumerate(coords)]
+    return evaluate_game(sticks, engine, timings), timings
+
+def play_batch(games, engine="sweep", workers=1, chunksize=64):
+    """
+    Yields (result, timings) for every game, in input order.
+    With workers > 1, games go to a process pool a window at a time, so only a few
+    chunks per worker are pending at once.
+    """
+    run = functools.partial(play_game, engine=engine)
+    if workers <= 1:
+        yield from map(run, games)
+        return
+
+    window = workers * chunksize * 4
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        games = iter(games)
+        while True:
+            batch = list(itertools.islice(games, window))
+            if not batch:
+                break
+            yield from pool.map(run, batch, chunksize=chunksize)
+
+def main():
+    parser = argparse.ArgumentParser(description="Kalyan vs Computer stick game.")
+    parser.add_argument("--batch", action="store_true",
+                        help="read a count T followed by T game blocks")
+    parser.add_argument("--jsonl", action="store_true",
+                        help="read one game per line as JSON")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="number of worker processes for batch input")
+    parser.add_argument("--chunksize", type=int, default=64,
+                        help="games handed to a worker at a time")
+    parser.add_argument("--engine", choices=sorted(PAIR_ENGINES), default="sweep",
+                        help="candidate stick-pair engine")
+    parser.add_argument("--timings", action="store_true",
+                        help="print one JSON line per game with per-stage seconds, "
+                             "and stage totals on stderr")
+    args = parser.parse_args()
+
+    if not args.batch and not args.jsonl:
+        result = solve(args.engine)
+        print(result)
+        return
+
+    games = read_jsonl(sys.stdin) if args.jsonl else read_counted(sys.stdin)
+    totals = dict.fromkeys(STAGES, 0.0)
+    out = sys.stdout
+    for k, (result, timings) in enumerate(play_batch(games, args.engine, args.workers, args.chunksize)):
+        if args.timings:
+            for stage, seconds in timings.items():
+                totals[stage] += seconds
+            out.write(json.dumps({"game": k, "result": result, "timings": timings}) + "\n")
+        else:
+            out.write(result + "\n")
+
+    if args.timings:
+        summary = "  ".join(f"{stage}={totals[stage]:.3f}s" for stage in STAGES)
+        print(f"stage totals: {summary}", file=sys.stderr)
+
 if __name__ == '__main__':
-    result = solve()
-    print(result)
+    main()
@@ -1,9 +1,258 @@
+import argparse
 import sys
 import collections
+import math
+from array import array
 
 # Set a high recursion limit for graph traversal in Cycle Finding and Isomorphism checks
 sys.setrecursionlimit(2000)
 
+# --- Permutation groups ---
+
+def compose(p1, p2):
+    """p2 followed by p1 (p1 * p2), as a tuple: result[i] = p1[p2[i]]."""
+    return tuple([p1[i] for i in p2])
+
+def invert(p):
+    inverse = [0] * len(p)
+    for i, image in enumerate(p):
+        inverse[image] = i
+    return tuple(inverse)
+
+class PermutationGroup:
+    """
+    The group generated by a set of permutations, as a base and strong generating
+    set built with the Schreier-Sims algorithm.
+
+    Level i is the stabilizer of base[0..i-1], generated by the strong generators
+    fixing those points, with a transversal: for every point x in the orbit of
+    base[i], a group element mapping base[i] to x. Membership is tested by sifting
+    through the levels and the order is the product of the orbit sizes, both in
+    time polynomial in the degree.
+    """
+    def __init__(self, generators, degree):
+        self.degree = degree
+        self.identity = tuple(range(degree))
+        self.base = []
+        self.strong_generators = [] # (generator, number of leading base points it fixes)
+        self.transversals = []
+        for g in generators:
+            g = tuple(g)
+            if g != self.identity:
+                self._add_generator(g, 0)
+        self._schreier_sims()
+
+    def _add_generator(self, g, fixed):
+        """Adds g, which fixes base[0..fixed-1], extending the base if it fixes all of it."""
+        if fixed == len(self.base):
+            self.base.append(next(i for i in range(self.degree) if g[i] != i))
+            self.transversals.append(None)
+        self.strong_generators.append((g, fixed))
+
+    def _orbit(self, level):
+        """Transversal of the orbit of base[level] under the strong generators of that level."""
+        generators = [g for g, fixed in self.strong_generators if fixed >= level]
+        point = self.base[level]
+        transversal = {point: self.identity}
+        queue = collections.deque([point])
+        while queue:
+            x = queue.popleft()
+            for g in generators:
+                y = g[x]
+                if y not in transversal:
+                    transversal[y] = compose(g, transversal[x])
+                    queue.append(y)
+        return transversal, generators
+
+    def _sift(self, g, start=0):
+        """
+        Strips g through the levels from start: returns the residue and the level it
+        stopped at (len(base) if it went through all of them).
+        """
+        for level in range(start, len(self.base)):
+            coset = self.transversals[level].get(g[self.base[level]])
+            if coset is None:
+                return g, level
+            g = compose(invert(coset), g)
+        return g, len(self.base)
+
+    def _schreier_sims(self):
+        """
+        Works up from the deepest level: every Schreier generator of a level must sift
+        to the identity through the levels below it. A residue that does not becomes
+        a new strong generator, and the check resumes at the level where it stopped.
+        """
+        for level in range(len(self.base)):
+            self.transversals[level] = self._orbit(level)[0]
+        level = len(self.base) - 1
+        while level >= 0:
+            transversal, generators = self._orbit(level)
+            self.transversals[level] = transversal
+            restart = None
+            for x, coset in transversal.items():
+                for g in generators:
+                    schreier = compose(invert(transversal[g[x]]), compose(g, coset))
+                    residue, stopped = self._sift(schreier, level + 1)
+                    if residue != self.identity:
+                        self._add_generator(residue, stopped)
+                        restart = stopped
+                        break
+                if restart is not None:
+                    break
+            if restart is None:
+                level -= 1
+            else:
+                # Levels level+1..restart gained a generator: rebuild their orbits
+                for deeper in range(level + 1, restart + 1):
+                    self.transversals[deeper] = self._orbit(deeper)[0]
+                level = restart
+
+    def order(self):
+        result = 1
+        for transversal in self.transversals:
+            result *= len(transversal)
+        return result
+
+    def contains(self, g):
+        residue, _ = self._sift(tuple(g))
+        return residue == self.identity
+
+# --- Graph isomorphism ---
+
+def refine_colours(adj_a, adj_b, nodes):
+    """
+    Colour refinement (1-dimensional Weisfeiler-Leman) run on two graphs at once, so
+    that equal colours mean the same thing in both: nodes start coloured by degree
+    and are split by the multiset of their neighbours' colours until stable.
+    Returns the colour of every node in each graph.
+    """
+    colours = ({u: len(adj_a[u]) for u in nodes}, {u: len(adj_b[u]) for u in nodes})
+    classes = len(set(colours[0].values()) | set(colours[1].values()))
+    while True:
+        signatures = {}
+        refined = ({}, {})
+        for adj, old, new in ((adj_a, colours[0], refined[0]), (adj_b, colours[1], refined[1])):
+            for u in nodes:
+                signature = (old[u], tuple(sorted(old[v] for v in adj[u])))
+                new[u] = signatures.setdefault(signature, len(signatures))
+        if len(signatures) == classes:
+            return refined
+        colours, classes = refined, len(signatures)
+
+def isomorphisms(adj_a, adj_b, nodes, fixed=()):
+    """
+    Yields every edge-preserving bijection of nodes from graph a onto graph b, as a
+    dict, that maps each node in fixed to itself. Candidates are restricted to nodes
+    of the same refined colour, and nodes are matched in an order that keeps each one
+    adjacent to earlier ones where possible, so that the incremental adjacency checks
+    prune as early as they can.
+    """
+    colours_a, colours_b = refine_colours(adj_a, adj_b, nodes)
+    by_colour = collections.defaultdict(list)
+    for v in nodes:
+        by_colour[colours_b[v]].append(v)
+    if sorted(colours_a.values()) != sorted(colours_b.values()):
+        return
+
+    # Match order: the fixed nodes (which have one candidate at most), then from the
+    # rarest colour, repeatedly the unmatched node with the most matched neighbours
+    # (rarest colour first on ties)
+    fixed = set(fixed)
+    order = [u for u in nodes if u in fixed]
+    placed = set(order)
+    links = dict.fromkeys(nodes, 0)
+    for u in order:
+        for v in adj_a[u]:
+            links[v] += 1
+    while len(order) < len(nodes):
+        u = max((v for v in nodes if v not in placed),
+                key=lambda v: (links[v], -len(by_colour[colours_a[v]]), -v))
+        order.append(u)
+        placed.add(u)
+        for v in adj_a[u]:
+            links[v] += 1
+
+    mapping = {}
+    used = set()
+
+    def extend(depth):
+        if depth == len(order):
+            yield dict(mapping)
+            return
+        u = order[depth]
+        mapped_neighbours = [mapping[w] for w in adj_a[u] if w in mapping]
+        if u in fixed:
+            candidates = (u,) if colours_b[u] == colours_a[u] else ()
+        else:
+            candidates = by_colour[colours_a[u]]
+        for v in candidates:
+            if v in used:
+                continue
+            # Edges to matched nodes must be kept, and no new ones may appear
+            adjacent = adj_b[v]
+            if any(x not in adjacent for x in mapped_neighbours):
+                continue
+            if sum(1 for x in adjacent if x in used) != len(mapped_neighbours):
+                continue
+            mapping[u] = v
+            used.add(v)
+            yield from extend(depth + 1)
+            del mapping[u]
+            used.discard(v)
+
+    yield from extend(0)
+
+# --- Ranked permutations ---
+
+def perm_rank(p):
+    """
+    Myrvold-Ruskey rank of a permutation of 0..n-1, an integer in [0, n!), in O(n).
+    p is used as scratch space and left as the identity.
+    """
+    inverse = [0] * len(p)
+    for i, x in enumerate(p):
+        inverse[x] = i
+    rank = 0
+    multiplier = 1
+    for i in range(len(p) - 1, 0, -1):
+        s = p[i]
+        j = inverse[i]
+        # Swap i into place and record the value it displaced
+        p[i], p[j] = i, s
+        inverse[s], inverse[i] = j, i
+        rank += s * multiplier
+        multiplier *= i + 1
+    return rank
+
+def perm_unrank(n, rank):
+    """The permutation of 0..n-1 with the given Myrvold-Ruskey rank, in O(n)."""
+    p = list(range(n))
+    for i in range(n, 0, -1):
+        rank, j = divmod(rank, i)
+        p[i - 1], p[j] = p[j], p[i - 1]
+    return p
+
+def meet_in_levels(frontiers, expand):
+    """
+    Bidirectional BFS driver.  Expands the smaller of the two frontiers one full level
+    at a time with expand(side, frontier), which returns the next frontier and the
+    cheapest total distance of a state in it already reached from the other side (or
+    -1), and answers with the first such distance.  Stopping at the first meeting state
+    instead could miss a cheaper one later in the same level, as the other side reached
+    states at different depths.
+    """
+    while frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        frontiers[side], best = expand(side, frontiers[side])
+        if best >= 0:
+            return best
+    return "Impossible"
+
+# Largest enclosure searched over ranks: two n! bytearrays (80 MB at n = 11)
+MAX_RANKED_NODES = 11
+
+SEARCHES = ("bidirectional", "ranked", "bfs")
+
 class ZoobinSolver:
     
     def __init__(self, E, current_edges, expected_edges):
@@ -24,6 +273,8 @@ class ZoobinSolver:
 
         self.nodes = sorted(list(self.G_cur_adj.keys()))
         self.N = self.max_node + 1 # Size for array-based permutation, nodes are 1-indexed
+        # Order of the group generated by the cycle rotations, once solve() has built it
+        self.group_order = None
 
     def _find_simple_cycles(self):
         """Finds all simple cycles in the current graph G_cur using DFS."""
@@ -106,66 +357,20 @@ class ZoobinSolver:
             
         return cycle_perms
 
-    def _find_target_permutation(self):
+    def _target_permutations(self, fixed=()):
         """
-        Finds the permutation sigma such that G_cur is isomorphic to G_exp under the mapping v -> sigma(v).
-        The result is a 1-based permutation array: sigma[u] = v means animal at u moves to v.
+        Yields every permutation sigma such that G_cur is isomorphic to G_exp under the
+        mapping v -> sigma(v), as 1-based permutation arrays: sigma[u] = v means the
+        animal at u moves to v. Nodes in fixed are kept in place.
         """
-        # We search for the mapping 'cur_node -> exp_node'
-        
-        cur_nodes = self.nodes
-        exp_nodes = cur_nodes # Nodes are the same set (1 to N_max)
-        
-        # Use an array to store the mapping (permutation array)
-        # pi[cur_node] = exp_node
-        pi = {} 
-        
-        # Initial mapping state: (cur_node, exp_node)
-        q = collections.deque([({}, cur_nodes, exp_nodes)]) # (current_pi, remaining_cur, remaining_exp)
-
-        # BFS to find the isomorphism
-        while q:
-            current_pi, remaining_cur, remaining_exp = q.popleft()
-
-            if not remaining_cur:
-                # Found the complete mapping!
-                
-                # Convert the map into the 1-based permutation array
-                sigma = list(range(self.N)) # Initializes to [0, 1, 2, ...]
-                for u_cur, v_exp in current_pi.items():
-                    sigma[u_cur] = v_exp
-                
-                return sigma
-
-            u_cur = remaining_cur[0]
-            
-            # Try to map u_cur to any available v_exp
-            for v_exp in remaining_exp:
-                is_compatible = True
-                
-                # Check compatibility with already mapped neighbors
-                for u_cur_neighbor in self.G_cur_adj[u_cur]:
-                    if u_cur_neighbor in current_pi:
-                        v_exp_neighbor = current_pi[u_cur_neighbor]
-                        
-                        # Check if the edge is preserved
-                        # Edge (u_cur, u_cur_neighbor) in G_cur must map to (v_exp, v_exp_neighbor) in G_exp
-                        if v_exp_neighbor not in self.G_exp_adj[v_exp]:
-                            is_compatible = False
-                            break
-                
-                if is_compatible:
-                    # If compatible, create the new state and push to queue
-                    new_pi = current_pi.copy()
-                    new_pi[u_cur] = v_exp
-                    
-                    new_remaining_cur = remaining_cur[1:]
-                    new_remaining_exp = [e for e in remaining_exp if e != v_exp]
-                    
-                    q.append((new_pi, new_remaining_cur, new_remaining_exp))
-        
-        # Should not happen in a valid problem instance
-        return None
+        # Both layouts must use the same enclosures
+        if set(self.G_exp_adj) != set(self.nodes):
+            return
+        for mapping in isomorphisms(self.G_cur_adj, self.G_exp_adj, self.nodes, fixed):
+            sigma = list(range(self.N)) # Initializes to [0, 1, 2, ...]
+            for u_cur, v_exp in mapping.items():
+                sigma[u_cur] = v_exp
+            yield sigma
 
     def _apply_permutation(self, p1, p2):
         """
@@ -178,43 +383,47 @@ class ZoobinSolver:
             res[i] = p1[p2[i]]
         return res
 
-    def _check_equal(self, p1, p2):
-        """Checks if two permutations are equal."""
-        for i in range(1, self.N):
-            if p1[i] != p2[i]:
-                return False
-        return True
-
-    def solve(self):
-        # 1. Find the target animal displacement permutation (Graph Isomorphism)
-        sigma = self._find_target_permutation()
-        if sigma is None:
-            return "Impossible" # Should not happen
+    def solve(self, search="bidirectional"):
+        # 1. The identity is a target exactly when both layouts have the same edges
+        if set(self.G_exp_adj) == set(self.nodes) and all(
+                self.G_cur_adj[u] == self.G_exp_adj[u] for u in self.nodes):
+            return 0
 
         # 2. Find all simple cycle rotation permutations in G_cur
         cycle_perms = self._find_simple_cycles()
         
-        # Handle the case where the graph has no cycles but needs a non-identity permutation
-        if not cycle_perms and not self._check_equal(sigma, list(range(self.N))):
-             # If sigma is not identity but no moves are possible, it's impossible.
-             # If sigma is identity, 0 rotations needed.
-             return 0 if self._check_equal(sigma, list(range(self.N))) else "Impossible"
-        
-        if not cycle_perms and self._check_equal(sigma, list(range(self.N))):
-            return 0
+        # If the identity is not a target and no moves are possible, it's impossible.
+        if not cycle_perms:
+            return "Impossible"
 
-        # 3. BFS on Permutation Space
-        
-        # Permutation array, 1-based indexing
-        identity_perm = list(range(self.N)) 
+        # 2b. Every target animal displacement permutation (Graph Isomorphism) is an
+        # acceptable final layout, but only those in the group generated by the
+        # rotations are reachable, which Schreier-Sims decides without enumerating
+        # the group. Its elements fix every node off the cycles, so the isomorphism
+        # search is pinned there and its results are filtered as they stream in.
+        group = PermutationGroup(cycle_perms, self.N)
+        self.group_order = group.order()
+        moved = {u for perm in cycle_perms for u in self.nodes if perm[u] != u}
+        fixed = [u for u in self.nodes if u not in moved]
+        targets = [sigma for sigma in self._target_permutations(fixed) if group.contains(sigma)]
+        if not targets:
+            return "Impossible"
 
-        if self._check_equal(sigma, identity_perm):
-            return 0
+        # 3. Shortest word search on Permutation Space, to whichever target is nearest
+        if search == "ranked" and len(self.nodes) <= MAX_RANKED_NODES:
+            return self._ranked_meet_in_the_middle(targets, cycle_perms)
+        if search in ("bidirectional", "ranked") and self.N <= 256:
+            return self._meet_in_the_middle(targets, cycle_perms)
+        return self._bfs(targets, cycle_perms)
+
+    def _bfs(self, targets, cycle_perms):
+        """BFS from the identity over products of cycle rotations until a target is reached."""
+        identity_perm = list(range(self.N))
 
         # State: tuple of permutation array elements (excluding index 0)
         # Using a tuple for hashing in the visited set
         start_state = tuple(identity_perm[1:])
-        target_state = tuple(sigma[1:])
+        target_states = {tuple(sigma[1:]) for sigma in targets}
 
         q = collections.deque([(start_state, 0)])
         visited = {start_state}
@@ -225,7 +434,7 @@ class ZoobinSolver:
             # Convert tuple back to list for operation
             current_perm = [0] + list(current_perm_tuple)
             
-            if current_perm_tuple == target_state:
+            if current_perm_tuple in target_states:
                 return steps
 
             for cycle_perm in cycle_perms:
@@ -239,8 +448,104 @@ class ZoobinSolver:
 
         return "Impossible"
 
+    def _meet_in_the_middle(self, targets, cycle_perms):
+        """
+        Bidirectional BFS: forward from the identity applying cycle rotations, backward
+        from all targets at once applying their inverses (undoing the last rotation),
+        one full level of the smaller frontier at a time.
+        """
+        # States are bytes (node labels fit in a byte), and applying a rotation c to a
+        # state p is p.translate(table of c), which computes c[p[i]] for every i in C.
+        def table(perm):
+            return bytes(perm) + bytes(range(len(perm), 256))
+
+        forward_tables = [table(perm) for perm in cycle_perms]
+        backward_tables = [table(invert(perm)) for perm in cycle_perms]
+        start = bytes(range(self.N))
+        target_states = dict.fromkeys(map(bytes, targets), 0)
+        if start in target_states:
+            return 0
+
+        dist = ({start: 0}, target_states)
+        tables = (forward_tables, backward_tables)
+
+        def expand(side, frontier):
+            mine, other = dist[side], dist[1 - side]
+            best = -1
+            next_frontier = []
+            for state in frontier:
+                d = mine[state] + 1
+                for step in tables[side]:
+                    next_state = state.translate(step)
+                    if next_state not in mine:
+                        mine[next_state] = d
+                        next_frontier.append(next_state)
+                    meet = other.get(next_state)
+                    if meet is not None and (best < 0 or d + meet < best):
+                        best = d + meet
+            return next_frontier, best
+
+        return meet_in_levels([[start], list(target_states)], expand)
+
+    def _ranked_meet_in_the_middle(self, targets, cycle_perms):
+        """
+        The bidirectional search over permutation ranks: each side's visited depths
+        live in a bytearray of n! entries (n = number of nodes) and the frontiers hold
+        bare ranks, so memory is fixed by n and no per-state tuples or dict entries are
+        kept.  Expanding a state still builds short-lived lists: the unranked
+        permutation and, for every rotation, its image through the index table.  That
+        makes it about twice as slow as _meet_in_the_middle(), in exchange for memory
+        that does not grow with the number of states visited.
+        """
+        n = len(self.nodes)
+        index = {node: i for i, node in enumerate(self.nodes)}
 
-def run_solver():
+        def table(perm):
+            return [index[perm[node]] for node in self.nodes]
+
+        forward_tables = [table(perm) for perm in cycle_perms]
+        backward_tables = [table(invert(perm)) for perm in cycle_perms]
+        start = perm_rank(list(range(n)))
+        target_ranks = array('q', {perm_rank(table(sigma)) for sigma in targets})
+        if start in target_ranks:
+            return 0
+
+        # depth + 1 of every visited rank, 0 where unvisited
+        size = math.factorial(n)
+        depths = (bytearray(size), bytearray(size))
+        depths[0][start] = 1
+        for rank in target_ranks:
+            depths[1][rank] = 1
+        levels = [0, 0]
+        tables = (forward_tables, backward_tables)
+
+        def expand(side, frontier):
+            mine, other = depths[side], depths[1 - side]
+            levels[side] = d = levels[side] + 1
+            if d >= 255:
+                raise OverflowError("search depth no longer fits a byte")
+            best = -1
+            next_frontier = array('q')
+            for rank in frontier:
+                p = perm_unrank(n, rank)
+                for step in tables[side]:
+                    next_rank = perm_rank([step[x] for x in p])
+                    if not mine[next_rank]:
+                        mine[next_rank] = d + 1
+                        next_frontier.append(next_rank)
+                    meet = other[next_rank]
+                    if meet and (best < 0 or d + meet - 1 < best):
+                        best = d + meet - 1
+            return next_frontier, best
+
+        try:
+            return meet_in_levels([array('q', [start]), target_ranks], expand)
+        except OverflowError:
+            # Deeper than a byte can record: finish with the bytes-keyed search
+            return self._meet_in_the_middle(targets, cycle_perms)
+
+
+def run_solver(show_group_order=False, search="bidirectional"):
     """Reads input from stdin and calls the solver."""
     try:
         # Read E
@@ -268,8 +573,19 @@ def run_solver():
         return "Impossible"
 
     solver = ZoobinSolver(E, current_edges, expected_edges)
-    return solver.solve()
+    result = solver.solve(search)
+    if show_group_order and solver.group_order is not None:
+        print(f"group order: {solver.group_order}", file=sys.stderr)
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Minimum cycle rotations to reach the expected enclosure layout.")
+    parser.add_argument("--group-order", action="store_true",
+                        help="report the order of the group generated by the cycle rotations on stderr")
+    parser.add_argument("--search", choices=SEARCHES, default="bidirectional",
+                        help="shortest rotation sequence search (both give the same answer)")
+    args = parser.parse_args()
+    print(run_solver(args.group_order, args.search))
 
 if __name__ == '__main__':
-    result = run_solver()
-    print(result)
+    main()
@@ -1,24 +1,351 @@
+import argparse
 import collections
+import heapq
 import sys
+import time
+from array import array
 
-def solve_ladder_problem():
+def blocked_prefix_sums(grid, M, N):
+    """
+    Builds 2D prefix sums of the blocked ('B') cells, once per grid.
+    P[r][c] is the number of blocked cells in rows 0..r-1 and columns 0..c-1.
+    """
+    P = [[0] * (N + 1) for _ in range(M + 1)]
+    for r in range(M):
+        row_total = 0
+        above = P[r]
+        current = P[r + 1]
+        for c in range(N):
+            if grid[r][c] == 'B':
+                row_total += 1
+            current[c + 1] = above[c + 1] + row_total
+    return P
+
+def count_blocked(P, r0, c0, r1, c1):
+    """Number of blocked cells in rows r0..r1-1 and columns c0..c1-1, in O(1)."""
+    return P[r1][c1] - P[r0][c1] - P[r1][c0] + P[r0][c0]
+
+def ladder_state(cells):
+    """
+    The (r, c, orientation) state that occupies exactly the given cells, or None if
+    they do not form one straight, contiguous ladder.
+    """
+    rows = {r for r, c in cells}
+    cols = {c for r, c in cells}
+    r0, c0 = min(rows), min(cols)
+    if len(rows) == 1 and len(cols) == len(cells) and max(cols) - c0 == len(cells) - 1:
+        return (r0, c0, 0) # Horizontal
+    if len(cols) == 1 and len(rows) == len(cells) and max(rows) - r0 == len(cells) - 1:
+        return (r0, c0, 1) # Vertical
+    return None
+
+STRATEGIES = ("bfs", "bidirectional", "astar")
+
+class LadderGrid:
+    """
+    The ladder state graph of one warehouse layout, built once and shared by queries.
+
+    States are encoded as integers (r * N + c) * 2 + o (o: 0 horizontal, 1 vertical).
+    Valid placements and clear rotation squares are precomputed into bytearrays, so
+    every edge test during a search is a single lookup. Full single-source distance
+    maps are kept in an LRU cache keyed by start state.
+    """
+    def __init__(self, grid, M, N, L, cache_size=8):
+        self.M = M
+        self.N = N
+        self.L = L
+        self.num_states = M * N * 2
+        self.cache_size = cache_size
+        self._distances = collections.OrderedDict()
+
+        # Blocked-cell counts for any rectangle in O(1)
+        blocked = blocked_prefix_sums(grid, M, N)
+
+        # valid[s]: the ladder fits at state s; rotatable[r * N + c]: the L x L square at (r, c) is clear
+        self.valid = bytearray(self.num_states)
+        self.rotatable = bytearray(M * N)
+        for r in range(M):
+            for c in range(N):
+                cell = r * N + c
+                if c + L <= N and count_blocked(blocked, r, c, r + 1, c + L) == 0:
+                    self.valid[cell * 2] = 1
+                if r + L <= M and count_blocked(blocked, r, c, r + L, c + 1) == 0:
+                    self.valid[cell * 2 + 1] = 1
+                if r + L <= M and c + L <= N and count_blocked(blocked, r, c, r + L, c + L) == 0:
+                    self.rotatable[cell] = 1
+
+    def encode(self, r, c, o):
+        return (r * self.N + c) * 2 + o
+
+    def decode(self, s):
+        r, c = divmod(s >> 1, self.N)
+        return r, c, s & 1
+
+    def neighbours(self, s):
+        """Returns the states one move or one rotation away from state s."""
+        N = self.N
+        valid = self.valid
+        cell = s >> 1
+        r, c = divmod(cell, N)
+        result = []
+
+        # A. Attempt Movement (Up, Down, Left, Right)
+        if r > 0 and valid[s - 2 * N]:
+            result.append(s - 2 * N)
+        if r < self.M - 1 and valid[s + 2 * N]:
+            result.append(s + 2 * N)
+        if c > 0 and valid[s - 2]:
+            result.append(s - 2)
+        if c < N - 1 and valid[s + 2]:
+            result.append(s + 2)
+
+        # B. Attempt Rotation
+        # Rotation is only possible if the L x L square starting at (r, c) is clear,
+        # which also makes the rotated position valid.
+        if self.rotatable[cell]:
+            result.append(s ^ 1)
+        return result
+
+    # --- Searches ---
+
+    def bfs(self, start, goal):
+        """Plain one-sided BFS from start until the goal state is dequeued."""
+        # Every state is enqueued at most once, so a flat int array the size of the
+        # state space serves as the queue, and BFS levels are consecutive slices of it.
+        visited = bytearray(self.num_states)
+        queue = array('i', bytes(4 * self.num_states))
+        visited[start] = 1
+        queue[0] = start
+        head, tail = 0, 1
+        steps = 0
+
+        while head < tail:
+            level_end = tail
+            while head < level_end:
+                s = queue[head]
+                head += 1
+
+                # Check for goal state
+                if s == goal:
+                    return steps
+
+                for ns in self.neighbours(s):
+                    if not visited[ns]:
+                        visited[ns] = 1
+                        queue[tail] = ns
+                        tail += 1
+            steps += 1
+
+        # If the queue empties without reaching the goal
+        return "Impossible"
+
+    def bidirectional(self, start, goal):
+        """BFS from both ends, always expanding the smaller frontier by one full level."""
+        # Every move and rotation can be undone, so the state graph is undirected and
+        # the goal can be searched from as well.
+        if start == goal:
+            return 0
+        dist = (array('i', [-1]) * self.num_states, array('i', [-1]) * self.num_states)
+        dist[0][start] = 0
+        dist[1][goal] = 0
+        frontiers = [[start], [goal]]
+
+        while frontiers[0] and frontiers[1]:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            mine, other = dist[side], dist[1 - side]
+            best = -1
+            next_frontier = []
+            for s in frontiers[side]:
+                d = mine[s] + 1
+                for ns in self.neighbours(s):
+                    if mine[ns] < 0:
+                        mine[ns] = d
+                        next_frontier.append(ns)
+                    if other[ns] >= 0:
+                        total = d + other[ns]
+                        if best < 0 or total < best:
+                            best = total
+            # The other side reached the states of this level at different depths, so the
+            # shortest ladder route is the best meeting over the whole level
+            if best >= 0:
+                return best
+            frontiers[side] = next_frontier
+
+        return "Impossible"
+
+    def astar(self, start, goal):
+        """A* with the Manhattan distance of the anchor cell plus one if orientation differs."""
+        goal_r, goal_c, goal_o = self.decode(goal)
+        N = self.N
+
+        def heuristic(s):
+            r, c = divmod(s >> 1, N)
+            return abs(r - goal_r) + abs(c - goal_c) + ((s & 1) ^ goal_o)
+
+        # The heuristic is consistent (a move changes the Manhattan term by at most one
+        # and a rotation only the orientation term), so the first goal pop is optimal.
+        g = array('i', [-1]) * self.num_states
+        closed = bytearray(self.num_states)
+        g[start] = 0
+        # Ties on f are broken towards the deeper state, which matters on open grids
+        heap = [(heuristic(start), 0, start)]
+
+        while heap:
+            _, _, s = heapq.heappop(heap)
+            if closed[s]:
+                continue
+            if s == goal:
+                return g[s]
+            closed[s] = 1
+            d = g[s] + 1
+            for ns in self.neighbours(s):
+                if not closed[ns] and (g[ns] < 0 or d < g[ns]):
+                    g[ns] = d
+                    heapq.heappush(heap, (d + heuristic(ns), -d, ns))
+
+        return "Impossible"
+
+    # --- Move sequences ---
+
+    def move_name(self, s, ns):
+        """The move ('U', 'D', 'L', 'R' or 'rotate') taking state s to its neighbour ns."""
+        if ns >> 1 == s >> 1:
+            return "rotate"
+        delta = ns - s
+        if delta == -2 * self.N:
+            return "U"
+        if delta == 2 * self.N:
+            return "D"
+        return "L" if delta == -2 else "R"
+
+    def next_states(self, start, goal):
+        """
+        BFS from goal until start is reached, recording for every visited state the
+        neighbour one step closer to goal. Returns that array('i') (-1 where unvisited),
+        or None if start cannot reach goal.
+        """
+        # Searching backwards is possible because every move can be undone, and it lets
+        # the path be walked forwards from start without reversing a copy of it.
+        towards = array('i', [-1]) * self.num_states
+        queue = array('i', bytes(4 * self.num_states))
+        towards[goal] = goal
+        queue[0] = goal
+        head, tail = 0, 1
+
+        while head < tail:
+            s = queue[head]
+            head += 1
+            if s == start:
+                return towards
+            for ns in self.neighbours(s):
+                if towards[ns] < 0:
+                    towards[ns] = s
+                    queue[tail] = ns
+                    tail += 1
+
+        return None
+
+    def iter_moves(self, start, goal, towards=None):
+        """
+        Yields the moves of one shortest path from start to goal, one at a time.
+        Yields nothing if goal is unreachable; pass towards from next_states to tell.
+        """
+        if towards is None:
+            towards = self.next_states(start, goal)
+            if towards is None:
+                return
+        s = start
+        while s != goal:
+            ns = towards[s]
+            yield self.move_name(s, ns)
+            s = ns
+
+    def path(self, start, goal):
+        """The moves of one shortest path between two (r, c, o) states as a list, or "Impossible"."""
+        if not all(0 <= r < self.M and 0 <= c < self.N and o in (0, 1) for r, c, o in (start, goal)):
+            return "Impossible"
+        s, t = self.encode(*start), self.encode(*goal)
+        if not self.valid[s] or not self.valid[t]:
+            return "Impossible"
+        towards = self.next_states(s, t)
+        if towards is None:
+            return "Impossible"
+        return list(self.iter_moves(s, t, towards))
+
+    # --- Cached queries ---
+
+    def distances_from(self, start):
+        """
+        Distance of every state from start (-1 if unreachable), as an array('i').
+        Maps are cached per start state; the least recently used one is evicted.
+        """
+        dist = self._distances.get(start)
+        if dist is not None:
+            self._distances.move_to_end(start)
+            return dist
+
+        dist = array('i', [-1]) * self.num_states
+        queue = array('i', bytes(4 * self.num_states))
+        dist[start] = 0
+        queue[0] = start
+        head, tail = 0, 1
+        while head < tail:
+            s = queue[head]
+            head += 1
+            d = dist[s] + 1
+            for ns in self.neighbours(s):
+                if dist[ns] < 0:
+                    dist[ns] = d
+                    queue[tail] = ns
+                    tail += 1
+
+        self._distances[start] = dist
+        if len(self._distances) > self.cache_size:
+            self._distances.popitem(last=False)
+        return dist
+
+    def query(self, start, goal, strategy=None):
+        """
+        Minimum steps between two (r, c, o) states, or "Impossible".
+        Without a strategy the answer comes from the cached distance map of start.
+        """
+        if not all(0 <= r < self.M and 0 <= c < self.N and o in (0, 1) for r, c, o in (start, goal)):
+            return "Impossible"
+        s, t = self.encode(*start), self.encode(*goal)
+        if not self.valid[s] or not self.valid[t]:
+            return "Impossible"
+        if strategy == "bidirectional":
+            return self.bidirectional(s, t)
+        if strategy == "astar":
+            return self.astar(s, t)
+        if strategy == "bfs":
+            return self.bfs(s, t)
+        d = self.distances_from(s)[t]
+        return d if d >= 0 else "Impossible"
+
+def read_grid(stream):
+    """Reads an 'M N' line followed by M rows of space-separated cells."""
+    line = stream.readline().strip()
+    if not line:
+        return None
+    M, N = map(int, line.split())
+    grid = []
+    for _ in range(M):
+        grid.append(stream.readline().strip().split())
+    return M, N, grid
+
+def solve_ladder_problem(strategy="bfs", moves=False):
+    """
+    Minimum steps for the problem on standard input, or "Impossible".
+    With moves=True, returns a generator of the moves of one shortest path instead.
+    """
     # Read M and N from the first line of standard input
     try:
-        # Increase recursion limit for potential deep calls, though BFS limits depth
-        sys.setrecursionlimit(2000) 
-        
-        # Read M and N
-        line = sys.stdin.readline().strip()
-        if not line:
+        parsed = read_grid(sys.stdin)
+        if parsed is None:
             # Handle empty input gracefully
             return "Impossible"
-        
-        M, N = map(int, line.split())
-        
-        # Read the grid
-        grid = []
-        for _ in range(M):
-            grid.append(sys.stdin.readline().strip().split())
+        M, N, grid = parsed
             
     except Exception:
         # Handle formatting errors or EOF
@@ -55,100 +382,157 @@ def solve_ladder_problem():
     start_state = (start_r, start_c, start_orientation)
     
     
-    # --- 2. Helper Functions for Checks ---
-
-    def is_valid_cell(r, c):
-        """Checks if a single cell is within bounds and not a Block ('B')."""
-        return 0 <= r < M and 0 <= c < N and grid[r][c] != 'B'
-
-    def is_valid_position(r, c, orientation, length):
-        """Checks if the entire ladder position is valid."""
-        if orientation == 0:  # Horizontal (occupies (r, c) to (r, c + L - 1))
-            if c + length > N: return False
-            for col in range(c, c + length):
-                if not is_valid_cell(r, col):
-                    return False
-        else:  # Vertical (occupies (r, c) to (r + L - 1, c))
-            if r + length > M: return False
-            for row in range(r, r + length):
-                if not is_valid_cell(row, c):
-                    return False
-        return True
-
-    def is_rotatable(r, c, length):
-        """
-        Checks if the L x L square area required for rotation is clear.
-        The L x L square starts at (r, c).
-        """
-        if r + length > M or c + length > N:
-            return False # Square extends beyond bounds
-            
-        for row in range(r, r + length):
-            for col in range(c, c + length):
-                if not is_valid_cell(row, col):
-                    return False
-        return True
-
-    def is_goal_state(r, c, orientation, length):
-        """Checks if the current position matches the destination ('L') configuration."""
-        
-        # The goal state must occupy exactly the destination cells.
-        current_occupied_cells = set()
-        
-        if orientation == 0:
-            for col in range(c, c + length):
-                current_occupied_cells.add((r, col))
-        else:
-            for row in range(r, r + length):
-                current_occupied_cells.add((row, c))
+    # The goal is the single state occupying exactly the 'L' cells
+    goal_state = ladder_state(end_coords)
+    if goal_state is None or len(end_coords) != L:
+        return "Impossible"
+    
+    
+    # --- 2. Build the state graph once ---
 
-        # Check if the set of occupied cells is exactly the set of 'L' cells
-        return current_occupied_cells == set(end_coords)
+    ladder_grid = LadderGrid(grid, M, N, L)
+    start = ladder_grid.encode(*start_state)
+    goal = ladder_grid.encode(*goal_state)
 
 
-    # --- 3. BFS Implementation ---
+    # --- 3. Search ---
 
-    queue = collections.deque([(start_state, 0)]) # (state, steps)
-    visited = {start_state} # Store only the (r, c, orientation) tuple
+    if moves:
+        towards = ladder_grid.next_states(start, goal)
+        if towards is None:
+            return "Impossible"
+        return ladder_grid.iter_moves(start, goal, towards)
+    if strategy == "bidirectional":
+        return ladder_grid.bidirectional(start, goal)
+    if strategy == "astar":
+        return ladder_grid.astar(start, goal)
+    return ladder_grid.bfs(start, goal)
 
-    # Directions: (dr, dc) for Up, Down, Left, Right
-    moves = [(-1, 0), (1, 0), (0, -1), (0, 1)] 
+def parse_state(fields):
+    """Parses 'r c o' with o as 0/1 or H/V."""
+    r, c, o = fields
+    o = {"H": 0, "V": 1}.get(o.upper(), o)
+    return int(r), int(c), int(o)
 
-    while queue:
-        (r, c, o), steps = queue.popleft()
+def run_queries(stream, query_lines, length=None, strategy=None, cache_size=8, moves=False):
+    """
+    Answers 'r1 c1 o1 r2 c2 o2' queries against the layout read from stream.
+    The ladder length is the number of 'l' cells in the layout unless given, and must
+    be at least 1 (ValueError otherwise).  Without a layout every query is "Impossible".
+    With moves=True each answer is a space-separated move sequence instead of a count.
+    """
+    try:
+        parsed = read_grid(stream)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        for line in query_lines:
+            if line.split():
+                yield "Impossible"
+        return
+    M, N, grid = parsed
+    if length is None:
+        length = sum(row.count('l') for row in grid)
+        if length < 1:
+            raise ValueError("the layout has no 'l' cells; give the ladder length with --length")
+    elif length < 1:
+        raise ValueError(f"ladder length must be at least 1, got {length}")
+    ladder_grid = LadderGrid(grid, M, N, length, cache_size)
+    for line in query_lines:
+        fields = line.split()
+        if not fields:
+            continue
+        try:
+            start, goal = parse_state(fields[:3]), parse_state(fields[3:6])
+        except ValueError:
+            yield "Impossible"
+            continue
+        if moves:
+            path = ladder_grid.path(start, goal)
+            yield path if path == "Impossible" else " ".join(path)
+        else:
+            yield ladder_grid.query(start, goal, strategy)
 
-        # Check for goal state
-        if is_goal_state(r, c, o, L):
-            return steps
+def benchmark(size=500, L=3):
+    """
+    Micro-benchmark of the BFS goal test on an open size x size grid: BFS states per
+    second when every dequeued state rebuilds the occupied-cell set (the old check)
+    versus a single integer comparison against the precomputed goal state.
+    """
+    grid = [['.'] * size for _ in range(size)]
+    ladder_grid = LadderGrid(grid, size, size, L)
+    start = ladder_grid.encode(0, 0, 0)
+    goal = ladder_grid.encode(size - 1, size - L, 0)
+    end_coords = [(size - 1, size - L + i) for i in range(L)]
 
-        # A. Attempt Movement (4 directions)
-        for dr, dc in moves:
-            nr, nc = r + dr, c + dc
-            new_state = (nr, nc, o)
-            
-            if new_state not in visited and is_valid_position(nr, nc, o, L):
-                visited.add(new_state)
-                queue.append((new_state, steps + 1))
+    def set_rebuild(s):
+        r, c, o = ladder_grid.decode(s)
+        if o == 0:
+            occupied = {(r, col) for col in range(c, c + L)}
+        else:
+            occupied = {(row, c) for row in range(r, r + L)}
+        return occupied == set(end_coords)
 
-        # B. Attempt Rotation
-        
-        # Rotation is only possible if the L x L square starting at (r, c) is clear.
-        if is_rotatable(r, c, L):
-            # Calculate new orientation and state
-            new_o = 1 - o # Flip orientation
-            new_state = (r, c, new_o)
-            
-            # The rotation is only valid if the new position itself is valid
-            # (Which is implicitly true if the L x L box check passed, 
-            # but we keep the explicit check for robustness, although it's redundant here 
-            # as the rotation check is stronger than the simple position check)
-            if new_state not in visited:
-                visited.add(new_state)
-                queue.append((new_state, steps + 1))
+    def state_equality(s):
+        return s == goal
 
-    # If the queue empties without reaching the goal
-    return "Impossible"
+    for name, is_goal in (("set rebuild", set_rebuild), ("state equality", state_equality)):
+        visited = bytearray(ladder_grid.num_states)
+        queue = array('i', bytes(4 * ladder_grid.num_states))
+        visited[start] = 1
+        queue[0] = start
+        head, tail = 0, 1
+        began = time.perf_counter()
+        while head < tail:
+            s = queue[head]
+            head += 1
+            if is_goal(s):
+                break
+            for ns in ladder_grid.neighbours(s):
+                if not visited[ns]:
+                    visited[ns] = 1
+                    queue[tail] = ns
+                    tail += 1
+        elapsed = time.perf_counter() - began
+        print(f"{name:>15}: {head} states in {elapsed:.2f}s ({head / elapsed:,.0f} states/s)")
 
-if __name__ == '__main__':
-    result = solve_ladder_problem()
+def main():
+    parser = argparse.ArgumentParser(description="Minimum moves to carry the ladder from 'l' to 'L'.")
+    parser.add_argument("--strategy", choices=STRATEGIES, default=None,
+                        help="search strategy (all return the same optimal step count)")
+    parser.add_argument("--queries", metavar="FILE",
+                        help="answer 'r1 c1 o1 r2 c2 o2' queries from FILE against the layout on stdin")
+    parser.add_argument("--length", type=int, default=None,
+                        help="ladder length for --queries (default: number of 'l' cells)")
+    parser.add_argument("--cache-size", type=int, default=8,
+                        help="distance maps kept for --queries (LRU)")
+    parser.add_argument("--moves", action="store_true",
+                        help="print the moves (U/D/L/R/rotate) of one shortest path instead of its length")
+    parser.add_argument("--benchmark", type=int, metavar="SIZE",
+                        help="time the BFS goal test on an open SIZE x SIZE grid and exit")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.benchmark)
+        return
+
+    if args.queries:
+        with open(args.queries) as query_file:
+            try:
+                for answer in run_queries(sys.stdin, query_file, args.length, args.strategy,
+                                          args.cache_size, args.moves):
+                    print(answer)
+            except ValueError as e:
+                parser.error(str(e))
+        return
+
+    result = solve_ladder_problem(args.strategy or "bfs", args.moves)
+    if args.moves and result != "Impossible":
+        # One move per line, printed as the path is walked
+        for move in result:
+            print(move)
+        return
     print(result)
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,239 @@
+import argparse
+import collections
+import random
 import sys
 
+try:
+    import numpy as np
+except ImportError:
+    # NumPy is optional: without it --full-stack --numpy falls back to the rope simulator
+    np = None
+
+# The NumPy layers are padded to the deepest stack; past this many times the cell
+# count (uneven stacks) the layer simulator gives up and the rope simulator is used.
+LAYER_SLACK = 4
+
 # Increase recursion limit for safety, although not strictly needed for this iterative solution
 sys.setrecursionlimit(2000)
 
+def parse_instruction(instruction):
+    """Splits 'h3' / 'v12' into ('h', 3); returns None for a malformed instruction."""
+    try:
+        return instruction[0], int(instruction[1:])
+    except (ValueError, IndexError):
+        return None
+
+def fold_sources(size, k, p):
+    """
+    For a fold at k of an axis of the given size, the positions before the fold that
+    stack onto position p after it: (base, folded), with folded = -1 where only the
+    base section covers p. The folded section is always the smaller one.
+    """
+    s1 = k  # Length of the top/left section
+    s2 = size - k  # Length of the bottom/right section
+    if s1 >= s2:
+        # Top/left section stays as the base; the other one lands on its last s2 positions
+        return p, (p + s2 if p >= s1 - s2 else -1)
+    # Bottom/right section becomes the base; the top/left one lands on its last s1 positions
+    return p + s1, (p - (s2 - s1) if p >= s2 - s1 else -1)
+
+class FoldIndexMap:
+    """
+    A fold sequence kept as per-axis index maps instead of stacks of cells.
+
+    Each fold only records (axis, size before, k), which together with fold_sources
+    maps any position after it back to the one or two positions it came from. Cells
+    are materialized on demand by walking the records backwards: a folded section is
+    reversed before it is placed on top, so the top of a stack is the bottom of the
+    folded part if there is one (after which the parity flips and only bottoms are
+    followed), and the bottom of a stack is always the bottom of the base.
+    """
+    def __init__(self, R, C):
+        self.R = R
+        self.C = C
+        self.folds = []
+
+    def fold(self, axis, k):
+        """Folds rows (axis 0, a horizontal fold) or columns (axis 1) at k, in O(1)."""
+        if axis == 0:
+            self.folds.append((0, self.R, k))
+            self.R = max(k, self.R - k)
+        else:
+            self.folds.append((1, self.C, k))
+            self.C = max(k, self.C - k)
+
+    def apply(self, type, k):
+        """Applies an 'h'/'v' instruction, ignoring it if k does not split the sheet."""
+        if type == 'h':
+            if 1 <= k < self.R:
+                self.fold(0, k)
+        elif type == 'v':
+            if 1 <= k < self.C:
+                self.fold(1, k)
+
+    def trace(self, r, c, want_top):
+        """
+        Follows the top (or bottom) of the stack at (r, c) back through the recorded
+        folds: returns the position before the first one and whether it is still the
+        top of the stack there that is wanted.
+        """
+        for axis, size, k in reversed(self.folds):
+            p = r if axis == 0 else c
+            base, folded = fold_sources(size, k, p)
+            if want_top and folded >= 0:
+                p = folded
+                want_top = False
+            else:
+                p = base
+            if axis == 0:
+                r = p
+            else:
+                c = p
+        return r, c, want_top
+
+    def trace_base(self, axis, p):
+        """
+        Follows position p of one axis back through the recorded folds along the base
+        sections only, which is how the bottom of a stack moves (on both axes) and
+        the top once it has come from a folded section.
+        """
+        for fold_axis, size, k in reversed(self.folds):
+            if fold_axis == axis:
+                p = fold_sources(size, k, p)[0]
+        return p
+
+def fold_top_bottom(R, C, steps):
+    """
+    Top and bottom original cell of an R x C sheet folded by the (type, k) steps, or
+    None unless it ends as a single stack. Arithmetic only, O(#folds), for any R, C.
+
+    Along each axis a fold is a translation: the base section shifts by 0 or by the
+    length of the top/left part, and the folded section shifts onto the base's last
+    positions. The bottom of the final stack follows base sections only, so its
+    coordinates are the summed base shifts. The top follows base sections back to
+    the latest fold whose folded section covers it there; it is the bottom of that
+    folded part, which differs from the bottom cell only along that fold's axis.
+    """
+    size = [R, C]
+    shift = [0, 0]  # Summed base shifts per axis
+    folds = []
+    for type, k in steps:
+        axis = 0 if type == 'h' else 1 if type == 'v' else None
+        if axis is None or not 1 <= k < size[axis]:
+            continue
+        s1 = k
+        s2 = size[axis] - k
+        if s1 >= s2:
+            # Base stays put; the folded part covers positions s1 - s2 onwards from s2 further on
+            base_shift, first_covered, offset = 0, s1 - s2, s2
+        else:
+            # Base moves up by s1; the folded part covers positions s2 - s1 onwards from s2 back
+            base_shift, first_covered, offset = s1, s2 - s1, -s2
+        shift[axis] += base_shift
+        folds.append((axis, base_shift, first_covered, offset))
+        size[axis] = max(s1, s2)
+
+    if size != [1, 1] or R * C <= 0:
+        return None
+    bottom = [shift[0], shift[1]]
+    top = list(bottom)
+    # Walk back from the final position 0 along base sections: the position on an
+    # axis is the base shift of the folds already walked back over.
+    walked = [0, 0]
+    for axis, base_shift, first_covered, offset in reversed(folds):
+        if walked[axis] >= first_covered:
+            top[axis] += offset
+            break
+        walked[axis] += base_shift
+    return C * top[0] + top[1] + 1, C * bottom[0] + bottom[1] + 1
+
+# --- Rope stacks ---
+#
+# A stack of cells is either a single original cell number (an int) or an immutable
+# node (reversed, upper, lower) standing for upper placed on lower, read in reverse
+# when the flag is set. Reversing a stack and placing it on another are both O(1)
+# new nodes that share their children; cells are only listed when asked for.
+
+def stack_reversed(stack):
+    """The stack turned upside down, in O(1)."""
+    if isinstance(stack, int):
+        return stack
+    flag, upper, lower = stack
+    return (not flag, upper, lower)
+
+def stack_concat(upper, lower):
+    """upper placed on top of lower, in O(1). None is the empty stack."""
+    if upper is None:
+        return lower
+    if lower is None:
+        return upper
+    return (False, upper, lower)
+
+def stack_end(stack, top=True):
+    """The top (or bottom) cell of a stack, walking down one node per level."""
+    while not isinstance(stack, int):
+        flag, upper, lower = stack
+        stack = upper if top != flag else lower
+        top = top != flag
+    return stack
+
+def stack_cells(stack):
+    """All cells of a stack from top to bottom."""
+    cells = []
+    pending = [(stack, False)]
+    while pending:
+        node, flipped = pending.pop()
+        if isinstance(node, int):
+            cells.append(node)
+            continue
+        flag, upper, lower = node
+        flipped = flipped != flag
+        # Push the part to be listed first last
+        if flipped:
+            pending.append((upper, True))
+            pending.append((lower, True))
+        else:
+            pending.append((lower, False))
+            pending.append((upper, False))
+    return cells
+
+# --- Layered NumPy sheet ---
+
+def fold_layers(layers, depths, axis, k):
+    """
+    Folds a (layers, R, C) array of cell numbers at k along axis 1 (rows) or 2 (columns).
+    Layer 0 is the top; 0 marks an empty slot above a stack shorter than the deepest.
+    depths is the (R, C) array of stack heights. Returns the folded (layers, depths).
+    """
+    if axis == 2:
+        layers, depths = fold_layers(layers.swapaxes(1, 2), depths.T, 1, k)
+        return layers.swapaxes(1, 2), depths.T
+    size = layers.shape[1]
+    s1 = k
+    s2 = size - k
+    if s1 >= s2:
+        base, depth_base = layers[:, :s1], depths[:s1]
+        folded, depth_folded = layers[:, s1:], depths[s1:]
+    else:
+        base, depth_base = layers[:, s1:], depths[s1:]
+        folded, depth_folded = layers[:, :s1], depths[:s1]
+    landing = base.shape[1] - folded.shape[1]
+    new_depths = depth_base.copy()
+    new_depths[landing:] += depth_folded
+    depth = int(new_depths.max())
+
+    # Stacks are bottom-aligned, so the base keeps its layers and only moves down
+    # below the new ones. The folded section is turned over (its layers reversed,
+    # which brings its cells to the top of each column) and each of its stacks is
+    # shifted down to sit right on the base stack of the position it lands on.
+    padding = np.zeros((depth - layers.shape[0],) + base.shape[1:], dtype=layers.dtype)
+    stacked = np.concatenate((padding, base), axis=0)
+    turned = np.flip(folded, axis=0)
+    shift = depth - new_depths[landing:]
+    layer, row, col = np.nonzero(np.arange(turned.shape[0]).reshape(-1, 1, 1) < depth_folded)
+    stacked[layer + shift[row, col], landing + row, col] = turned[layer, row, col]
+    return stacked, new_depths
+
 class FoldedSheetSolver:
     
     def __init__(self, R, C, instructions):
@@ -11,8 +242,9 @@ class FoldedSheetSolver:
         self.R = R
         self.C = C
         self.instructions = instructions
-        # Sheet[r][c] holds a list of original cell numbers, from top (index 0) to bottom (last index)
-        self.sheet = self._initialize_sheet()
+        # Sheet[r][c] holds a rope stack of original cell numbers (see stack_cells for top to bottom).
+        # It is only built by simulate(); solve() works on index maps.
+        self.sheet = None
 
     def _initialize_sheet(self):
         """Initializes the sheet with original cell numbers (1 to R*C)."""
@@ -21,7 +253,7 @@ class FoldedSheetSolver:
             row = []
             for c in range(self.C):
                 original_cell_number = self.initial_C * r + c + 1
-                row.append([original_cell_number])
+                row.append(original_cell_number)
             sheet.append(row)
         return sheet
 
@@ -36,14 +268,14 @@ class FoldedSheetSolver:
         
         # Determine the resulting number of rows
         new_R = max(r1, r2)
-        new_sheet = [[[] for _ in range(self.C)] for _ in range(new_R)]
+        new_sheet = [[None] * self.C for _ in range(new_R)]
         
         # Case 1: Top section (r1) is the larger/equal base
         if r1 >= r2:
             # Copy top section (rows 0 to r1-1) to be the base (rows 0 to r1-1)
             for r in range(r1):
                 for c in range(self.C):
-                    new_sheet[r][c].extend(self.sheet[r][c])
+                    new_sheet[r][c] = self.sheet[r][c]
 
             # Fold bottom section (rows R-1 down to R-r2) onto the base
             for r_fold in range(self.R - 1, self.R - r2 - 1, -1):
@@ -55,8 +287,8 @@ class FoldedSheetSolver:
                     for c in range(self.C):
                         # Cells from the folded (bottom) section must be vertically mirrored
                         # by reversing their stack order, and then placed ON TOP of the base stack.
-                        folded_stack = self.sheet[r_fold][c][::-1]
-                        new_stack = folded_stack + new_sheet[r_base][c]
+                        folded_stack = stack_reversed(self.sheet[r_fold][c])
+                        new_stack = stack_concat(folded_stack, new_sheet[r_base][c])
                         new_sheet[r_base][c] = new_stack
 
         # Case 2: Bottom section (r2) is the larger base
@@ -64,7 +296,7 @@ class FoldedSheetSolver:
             # Copy bottom section (rows r1 to R-1) to be the base (rows 0 to r2-1)
             for r in range(r2):
                 for c in range(self.C):
-                    new_sheet[r][c].extend(self.sheet[r1 + r][c])
+                    new_sheet[r][c] = self.sheet[r1 + r][c]
 
             # Fold top section (rows r1-1 down to 0) onto the base
             for r_fold in range(r1 - 1, -1, -1):
@@ -76,8 +308,8 @@ class FoldedSheetSolver:
                     for c in range(self.C):
                         # Cells from the folded (top) section must be vertically mirrored
                         # by reversing their stack order, and then placed ON TOP of the base stack.
-                        folded_stack = self.sheet[r_fold][c][::-1]
-                        new_stack = folded_stack + new_sheet[r_base][c]
+                        folded_stack = stack_reversed(self.sheet[r_fold][c])
+                        new_stack = stack_concat(folded_stack, new_sheet[r_base][c])
                         new_sheet[r_base][c] = new_stack
         
         self.R = new_R
@@ -94,14 +326,14 @@ class FoldedSheetSolver:
         
         # Determine the resulting number of columns
         new_C = max(c1, c2)
-        new_sheet = [[[] for _ in range(new_C)] for _ in range(self.R)]
+        new_sheet = [[None] * new_C for _ in range(self.R)]
 
         # Case 1: Left section (c1) is the larger/equal base
         if c1 >= c2:
             # Copy left section (cols 0 to c1-1) to be the base (cols 0 to c1-1)
             for r in range(self.R):
                 for c in range(c1):
-                    new_sheet[r][c].extend(self.sheet[r][c])
+                    new_sheet[r][c] = self.sheet[r][c]
 
             # Fold right section (cols C-1 down to C-c2) onto the base
             for c_fold in range(self.C - 1, self.C - c2 - 1, -1):
@@ -113,8 +345,8 @@ class FoldedSheetSolver:
                     for r in range(self.R):
                         # Cells from the folded (right) section must be horizontally mirrored
                         # by reversing their stack order, and then placed ON TOP of the base stack.
-                        folded_stack = self.sheet[r][c_fold][::-1]
-                        new_stack = folded_stack + new_sheet[r][c_base]
+                        folded_stack = stack_reversed(self.sheet[r][c_fold])
+                        new_stack = stack_concat(folded_stack, new_sheet[r][c_base])
                         new_sheet[r][c_base] = new_stack
 
         # Case 2: Right section (c2) is the larger base
@@ -122,7 +354,7 @@ class FoldedSheetSolver:
             # Copy right section (cols c1 to C-1) to be the base (cols 0 to c2-1)
             for r in range(self.R):
                 for c in range(c2):
-                    new_sheet[r][c].extend(self.sheet[r][c1 + c])
+                    new_sheet[r][c] = self.sheet[r][c1 + c]
 
             # Fold left section (cols c1-1 down to 0) onto the base
             for c_fold in range(c1 - 1, -1, -1):
@@ -134,42 +366,283 @@ class FoldedSheetSolver:
                     for r in range(self.R):
                         # Cells from the folded (left) section must be horizontally mirrored
                         # by reversing their stack order, and then placed ON TOP of the base stack.
-                        folded_stack = self.sheet[r][c_fold][::-1]
-                        new_stack = folded_stack + new_sheet[r][c_base]
+                        folded_stack = stack_reversed(self.sheet[r][c_fold])
+                        new_stack = stack_concat(folded_stack, new_sheet[r][c_base])
                         new_sheet[r][c_base] = new_stack
 
         self.C = new_C
         self.sheet = new_sheet
 
 
-    def solve(self) -> str:
-        """Applies all folding instructions sequentially and returns the top and bottom cell."""
-        
+    def _instructions(self):
+        """Yields the well-formed (type, k) instructions, skipping malformed ones."""
         for instruction in self.instructions:
-            try:
-                type = instruction[0]
-                k = int(instruction[1:])
-            except (ValueError, IndexError):
-                # Should not happen based on constraints, but handles malformed instruction
-                continue 
-                
+            parsed = parse_instruction(instruction)
+            if parsed is not None:
+                # Should not happen based on constraints, but malformed instructions are skipped
+                yield parsed
+
+    def simulate(self):
+        """Applies all folding instructions to the full sheet of stacks."""
+        self.R = self.initial_R
+        self.C = self.initial_C
+        self.sheet = self._initialize_sheet()
+        for type, k in self._instructions():
             if type == 'h':
                 if 1 <= k < self.R:
                     self._fold_horizontal(k)
             elif type == 'v':
                 if 1 <= k < self.C:
                     self._fold_vertical(k)
+        return self.sheet
+
+    def simulate_layers(self):
+        """
+        Applies all folding instructions to a (layers, R, C) NumPy array of the sheet.
+        Returns None once the padded array outgrows LAYER_SLACK times the cell count.
+        """
+        self.R = self.initial_R
+        self.C = self.initial_C
+        limit = LAYER_SLACK * self.R * self.C
+        dtype = np.int32 if self.R * self.C < 2 ** 31 else np.int64
+        layers = np.arange(1, self.R * self.C + 1, dtype=dtype).reshape(1, self.R, self.C)
+        depths = np.ones((self.R, self.C), dtype=np.int64)
+        for type, k in self._instructions():
+            if type == 'h':
+                if 1 <= k < self.R:
+                    layers, depths = fold_layers(layers, depths, 1, k)
+                    self.R = layers.shape[1]
+            elif type == 'v':
+                if 1 <= k < self.C:
+                    layers, depths = fold_layers(layers, depths, 2, k)
+                    self.C = layers.shape[2]
+            if layers.size > limit:
+                return None
+        return layers
+
+    def full_stack(self, use_numpy=False) -> str:
+        """
+        Simulates all folds and returns every cell of the final stack, top to bottom.
+        Uses the rope simulator; with use_numpy (and NumPy installed) the layer
+        simulator is tried first, falling back to the rope if its padding blows up.
+        """
+        if use_numpy and np is not None:
+            layers = self.simulate_layers()
+            if layers is not None:
+                if self.R == 1 and self.C == 1 and layers.size:
+                    column = layers[:, 0, 0]
+                    return " ".join(map(str, column[column != 0].tolist()))
+                return "Error: Final sheet not 1x1 or empty."
+        sheet = self.simulate()
+        if self.R == 1 and self.C == 1:
+            return " ".join(map(str, stack_cells(sheet[0][0])))
+        return "Error: Final sheet not 1x1 or empty."
+
+    def solve(self) -> str:
+        """Follows the folding instructions arithmetically and returns the top and bottom cell."""
+        result = fold_top_bottom(self.initial_R, self.initial_C, self._instructions())
         
         # After all folds, the sheet must be 1x1.
-        if self.R == 1 and self.C == 1 and self.sheet[0][0]:
-            top_cell = self.sheet[0][0][0]
-            bottom_cell = self.sheet[0][0][-1]
+        if result is not None:
+            self.R = self.C = 1
+            top_cell, bottom_cell = result
             return f"{top_cell} {bottom_cell}"
         else:
             # Should not happen in a valid test case that completely folds the sheet
             return "Error: Final sheet not 1x1 or empty."
 
-def run_solver():
+def cross_check(trials=1000, max_size=12, seed=0):
+    """
+    Compares solve() with the top and bottom of the simulated sheet on random fold
+    sequences (including malformed and out-of-range instructions). Returns the
+    mismatching (R, C, instructions) cases.
+    """
+    rng = random.Random(seed)
+    mismatches = []
+    for _ in range(trials):
+        R = rng.randint(1, max_size)
+        C = rng.randint(1, max_size)
+        instructions = []
+        rows, cols = R, C
+        while rows > 1 or cols > 1:
+            if rng.random() < 0.1:
+                instructions.append(rng.choice(("h0", "v0", f"h{rows}", "x1", "v")))
+            if rows > 1 and (cols == 1 or rng.random() < 0.5):
+                k = rng.randint(1, rows - 1)
+                instructions.append(f"h{k}")
+                rows = max(k, rows - k)
+            else:
+                k = rng.randint(1, cols - 1)
+                instructions.append(f"v{k}")
+                cols = max(k, cols - k)
+
+        solver = FoldedSheetSolver(R, C, instructions)
+        sheet = solver.simulate()
+        expected = f"{stack_end(sheet[0][0], top=True)} {stack_end(sheet[0][0], top=False)}"
+        if solver.solve() != expected:
+            mismatches.append((R, C, instructions))
+    return mismatches
+
+# --- Batches of sequences on one sheet ---
+
+class _TrieNode:
+    __slots__ = ("children", "ends")
+
+    def __init__(self):
+        self.children = {}
+        self.ends = 0
+
+class _BranchState:
+    """
+    The fold state at a trie branch point: the index map of the folds since the
+    previous branch point, a link to that branch point's state, and, per axis, the
+    original coordinates already resolved from positions here along base sections.
+    The memos are dropped (origins is None) once the state leaves the LRU cache.
+    """
+    __slots__ = ("index_map", "parent", "origins")
+
+    def __init__(self, index_map, parent):
+        self.index_map = index_map
+        self.parent = parent
+        self.origins = ({}, {})
+
+class FoldTrie:
+    """
+    Instruction sequences for one R x C sheet, merged into a prefix tree so that the
+    folds of a shared prefix are applied once.
+
+    Fold states are kept, in index-map form, for the branch points where sequences
+    diverge or end, in an LRU cache of at most cache_size states. A sequence resumes
+    from the deepest cached branch point on its path, and the coordinates resolved
+    through a branch point are memoized there for the sequences that follow. An
+    evicted state loses its memos, and new states skip over evicted ancestors by
+    taking over their folds, so neither outlives the cache for long.
+    """
+    def __init__(self, R, C, cache_size=1024):
+        self.R = R
+        self.C = C
+        self.cache_size = cache_size
+        self.root = _TrieNode()
+        self.root_state = _BranchState(FoldIndexMap(R, C), None)
+        self._states = collections.OrderedDict()
+        self._parsed = {}
+
+    def _parse(self, instructions):
+        # Sequences repeat the same few instructions, so each distinct one is parsed once
+        steps = []
+        for instruction in instructions:
+            parsed = self._parsed.get(instruction)
+            if parsed is None:
+                parsed = self._parsed[instruction] = parse_instruction(instruction) or ()
+            if parsed:
+                steps.append(parsed)
+        return steps
+
+    def add(self, instructions):
+        node = self.root
+        for step in self._parse(instructions):
+            child = node.children.get(step)
+            if child is None:
+                child = node.children[step] = _TrieNode()
+            node = child
+        node.ends += 1
+
+    def solve(self, instructions) -> str:
+        """The top and bottom cell for a sequence previously passed to add()."""
+        steps = self._parse(instructions)
+
+        # Resume from the deepest cached branch point on the path
+        state, resume, resume_node = self.root_state, 0, self.root
+        node = self.root
+        for i, step in enumerate(steps):
+            node = node.children[step]
+            cached = self._states.get(node)
+            if cached is not None:
+                self._states.move_to_end(node)
+                state, resume, resume_node = cached, i + 1, node
+
+        # Apply the rest, starting a new index map at every branch point passed
+        node = resume_node
+        index_map = FoldIndexMap(state.index_map.R, state.index_map.C)
+        for step in steps[resume:]:
+            index_map.apply(*step)
+            node = node.children[step]
+            if len(node.children) > 1 or (node.ends and node.children):
+                state = self._branch(index_map, state)
+                self._states[node] = state
+                if len(self._states) > self.cache_size:
+                    self._states.popitem(last=False)[1].origins = None
+                index_map = FoldIndexMap(index_map.R, index_map.C)
+
+        if index_map.R == 1 and index_map.C == 1 and self.R * self.C > 0:
+            top_cell = self._resolve(index_map, state, True)
+            bottom_cell = self._resolve(index_map, state, False)
+            return f"{top_cell} {bottom_cell}"
+        return "Error: Final sheet not 1x1 or empty."
+
+    @staticmethod
+    def _branch(index_map, parent):
+        """A new branch state below parent, folding evicted ancestors into its index map."""
+        while parent.parent is not None and parent.origins is None:
+            index_map.folds[:0] = parent.index_map.folds
+            parent = parent.parent
+        return _BranchState(index_map, parent)
+
+    def _resolve(self, index_map, state, top):
+        """Traces the stack at (0, 0) back to an original cell through the branch states."""
+        r, c, want_top = index_map.trace(0, 0, top)
+        while want_top and state.parent is not None:
+            r, c, want_top = state.index_map.trace(r, c, True)
+            state = state.parent
+        # Once the wanted cell only follows base sections, the axes are independent
+        # and each one is resolved through the per-axis memos.
+        return self.C * self._origin(state, 0, r) + self._origin(state, 1, c) + 1
+
+    @staticmethod
+    def _origin(state, axis, p):
+        """Original coordinate reached from position p at state along base sections."""
+        visited = []
+        while state.parent is not None:
+            if state.origins is not None:
+                origin = state.origins[axis].get(p)
+                if origin is not None:
+                    break
+                visited.append((state, p))
+            p = state.index_map.trace_base(axis, p)
+            state = state.parent
+        else:
+            origin = p
+        for seen, seen_p in visited:
+            seen.origins[axis][seen_p] = origin
+        return origin
+
+def run_batch(stream, cache_size=1024):
+    """
+    Reads an 'R C' line followed by one instruction sequence per line, and yields
+    the answer for each sequence in order (an error for a blank line).  A missing or
+    malformed 'R C' line yields the same error as run_solver() and nothing else.
+    """
+    line = stream.readline().strip()
+    if not line:
+        yield "Error: Missing R C input."
+        return
+    try:
+        R, C = map(int, line.split())
+    except ValueError as e:
+        yield f"Error reading input: {e}"
+        return
+    sequences = [line.split() for line in stream]
+    trie = FoldTrie(R, C, cache_size)
+    for instructions in sequences:
+        if instructions:
+            trie.add(instructions)
+    for instructions in sequences:
+        if not instructions:
+            yield "Error: Missing instructions."
+            continue
+        yield trie.solve(instructions)
+
+def run_solver(full_stack=False, use_numpy=False):
     """Reads input from stdin and calls the solver."""
     try:
         # Read R and C
@@ -186,9 +659,39 @@ def run_solver():
         return f"Error reading input: {e}"
 
     solver = FoldedSheetSolver(R, C, instructions)
+    if full_stack:
+        return solver.full_stack(use_numpy)
     return solver.solve()
 
+def main():
+    parser = argparse.ArgumentParser(description="Top and bottom cell of a folded R x C sheet.")
+    parser.add_argument("--full-stack", action="store_true",
+                        help="print every cell of the final stack, from top to bottom")
+    parser.add_argument("--numpy", action="store_true",
+                        help="try the NumPy layer simulator for --full-stack (falls back to "
+                             "the rope simulator if NumPy is missing or the stacks are uneven)")
+    parser.add_argument("--batch", action="store_true",
+                        help="read an 'R C' line, then one instruction sequence per line")
+    parser.add_argument("--cache-size", type=int, default=1024,
+                        help="fold states kept at shared-prefix branch points for --batch (LRU)")
+    parser.add_argument("--self-check", type=int, metavar="TRIALS",
+                        help="cross-check the arithmetic solver against the simulator on random sheets")
+    args = parser.parse_args()
+
+    if args.self_check:
+        mismatches = cross_check(args.self_check)
+        for R, C, instructions in mismatches:
+            print(R, C, " ".join(instructions))
+        print(f"{len(mismatches)} mismatches in {args.self_check} trials")
+        return
+
+    if args.batch:
+        for answer in run_batch(sys.stdin, args.cache_size):
+            print(answer)
+        return
+
+    print(run_solver(args.full_stack, args.numpy))
+
 # Execute the solver logic
 if __name__ == "__main__":
-    result = run_solver()
-    print(result)
\ No newline at end of file
+    main()
\ No newline at end of file